@@ -1,9 +1,64 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.text import slugify
 
 # Register your models here.
-from django.contrib import admin
 from .models import Category, Post, Comment
 
+
+# -------------------------
+# ⚡ LARGE-TABLE HELPERS
+# -------------------------
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses PostgreSQL's planner estimate instead of COUNT(*) for unfiltered
+    changelists on large tables. Filtered lists (and other databases) still
+    get an exact count.
+    """
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if not queryset.query.where and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.estimate_threshold:
+                return row[0]
+        return super().count
+
+
+class IndexedSearchMixin:
+    """
+    Replaces the admin's `icontains` search (a full table scan) with lookups
+    an index can answer. `indexed_search_lookups` maps each lookup to the
+    function that prepares the search term for it.
+    """
+    indexed_search_lookups = {}
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        query = Q()
+        for lookup, prepare in self.indexed_search_lookups.items():
+            query |= Q(**{lookup: prepare(term)})
+        return queryset.filter(query), False
+
+
+class LargeTableAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # skip the extra unfiltered COUNT(*) when filtering
+
+
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug']
@@ -12,20 +67,52 @@ class CategoryAdmin(admin.ModelAdmin):
     readonly_fields = []
     list_filter = []
 
+
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeTableAdmin):
     list_display = ['title', 'author', 'category', 'published', 'created_at', 'view_count']
-    search_fields = ['title', 'content', 'author__username']
-    list_filter = ['published', 'category', 'created_at']
+    list_select_related = ['author', 'category']
+    search_fields = ['slug', 'author__username']
+    search_help_text = 'Title prefix (matched against the slug) or exact author username.'
+    indexed_search_lookups = {
+        'slug__startswith': slugify,
+        'author__username': str,
+    }
+    list_filter = ['published', 'category']
+    date_hierarchy = 'created_at'
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = ['created_at', 'updated_at', 'view_count']
     autocomplete_fields = ['author', 'category']
+    raw_id_fields = ['likes']  # never render every user as an option
     fields = ['title', 'slug', 'author', 'category', 'content', 'published', 'view_count', 'likes']
 
+
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ['post', 'author', 'approved', 'created_at']
-    search_fields = ['body', 'author__username']
-    list_filter = ['approved', 'created_at']
-    readonly_fields = ['created_at']
-    autocomplete_fields = ['author', 'post']
\ No newline at end of file
+class CommentAdmin(LargeTableAdmin):
+    list_display = ['post', 'author', 'approved', 'created_at', 'deleted_at']
+    list_select_related = ['post', 'author']
+    search_fields = ['post__slug', 'author__username']
+    search_help_text = 'Post title prefix (matched against the slug) or exact author username.'
+    indexed_search_lookups = {
+        'post__slug__startswith': slugify,
+        'author__username': str,
+    }
+    list_filter = ['approved', ('deleted_at', admin.EmptyFieldListFilter)]
+    date_hierarchy = 'created_at'
+    readonly_fields = ['created_at', 'deleted_at']
+    autocomplete_fields = ['author', 'post']
+    actions = ['restore_comments']
+
+    def get_queryset(self, request):
+        # ✅ Soft-deleted comments stay visible here until `archive_comments`
+        # moves them, so moderators can review and restore them.
+        queryset = Comment.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    @admin.action(description='Restore selected deleted comments')
+    def restore_comments(self, request, queryset):
+        restored = queryset.filter(deleted_at__isnull=False).update(deleted_at=None)
+        self.message_user(request, f'Restored {restored} comments.')
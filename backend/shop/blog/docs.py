@@ -0,0 +1,110 @@
+"""
+API documentation views.
+
+The OpenAPI schema is generated at build time by `manage.py build_api_schema`
+and served straight from disk. drf_yasg is only imported when the docs are
+first requested (or when no prebuilt schema exists), so it stays out of
+worker startup.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.views.decorators.http import etag, require_safe
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+API_VERSION = "v1"
+
+_schema_cache = {}
+
+
+# =========================
+# Schema generation (drf_yasg, imported lazily)
+# =========================
+def api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Blog API",
+        default_version=API_VERSION,
+        description="This is the interactive documentation for your Blog API endpoints. "
+                    "You can test each route directly here without using Postman.",
+        contact=openapi.Contact(email="support@blogapi.com"),
+        license=openapi.License(name="MIT License"),
+    )
+
+
+def generate_schema(url=None):
+    """Introspect every viewset and return the OpenAPI schema as JSON bytes."""
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    generator = OpenAPISchemaGenerator(info=api_info(), version=API_VERSION, url=url)
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def schema_path(version=API_VERSION):
+    return settings.API_SCHEMA_DIR / f"openapi-{version}.json"
+
+
+# =========================
+# Prebuilt schema view
+# =========================
+def _load_schema():
+    """
+    Return (content, etag) for the prebuilt schema, re-reading it only when
+    the file changes. Falls back to generating it in-process (once) when
+    `build_api_schema` has not been run.
+    """
+    path = schema_path()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    cached = _schema_cache.get("schema")
+    if cached is None or cached[0] != mtime:
+        if mtime is None:
+            logger.warning("%s not found; generating the API schema at runtime. "
+                           "Run `manage.py build_api_schema` at build time.", path)
+            content = generate_schema()
+        else:
+            content = path.read_bytes()
+        cached = (mtime, content, f'"{hashlib.sha256(content).hexdigest()[:32]}"')
+        _schema_cache["schema"] = cached
+    return cached[1], cached[2]
+
+
+@require_safe
+@etag(lambda request: _load_schema()[1])
+def openapi_schema(request):
+    content, _ = _load_schema()
+    response = HttpResponse(content, content_type="application/json")
+    response["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+# =========================
+# Swagger & ReDoc UI (lazy)
+# =========================
+def _ui_view(ui):
+    @require_safe
+    def view(request):
+        # Only the page shell is rendered here; the browser then fetches
+        # SPEC_URL (the prebuilt schema). drf_yasg's own SchemaView would run
+        # the schema generator on every page load, so it is not used.
+        from drf_yasg import openapi
+        from drf_yasg.renderers import ReDocRenderer, SwaggerUIRenderer
+
+        renderer = SwaggerUIRenderer() if ui == "swagger" else ReDocRenderer()
+        page = renderer.render(openapi.Swagger(info=api_info(), _prefix="/"), renderer_context={"request": request})
+        return HttpResponse(page, content_type="text/html; charset=utf-8")
+
+    return view
+
+
+swagger_ui = _ui_view("swagger")
+redoc = _ui_view("redoc")
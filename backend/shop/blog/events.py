@@ -0,0 +1,261 @@
+"""
+Server-Sent Events for live post updates (likes, comments).
+
+Views publish compact deltas to a channel per post and per category; the
+async `post_events` / `category_events` views stream them to browsers.
+Serving these streams needs an ASGI server (see shop/asgi.py): every open tab
+holds a connection but costs no worker thread. Under WSGI the views answer
+503 instead, since Django would have to consume the endless stream before
+sending a byte.
+
+The broker is pluggable through settings.EVENTS_BROKER. The default
+InProcessBroker only reaches subscribers in the same process, so multi-process
+deployments should point it at a shared implementation (e.g. Redis pub/sub)
+exposing the same `publish` / `subscribe` interface.
+"""
+import asyncio
+import functools
+import itertools
+import json
+import secrets
+import threading
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+
+from .models import Category, Post
+
+
+# -------------------------
+# 📡 IN-PROCESS BROKER
+# -------------------------
+class Event:
+    __slots__ = ('id', 'seq', 'type', 'data')
+
+    def __init__(self, id, seq, type, data):
+        self.id = id
+        self.seq = seq
+        self.type = type
+        self.data = data
+
+    def encode(self):
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n".encode()
+
+
+class Subscription:
+    """A subscriber's bounded queue, fed from any thread via its event loop."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def offer(self, event):
+        # Runs on the subscriber's loop. A consumer that can't keep up is cut
+        # off rather than buffered without limit; the browser reconnects with
+        # Last-Event-ID and catches up from the replay buffer.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class Channel:
+    def __init__(self, replay_size, floor):
+        self.replay = deque(maxlen=replay_size)
+        self.subscribers = set()
+        # The replay holds every event for this channel with seq > floor.
+        self.floor = floor
+
+    def append(self, event):
+        if len(self.replay) == self.replay.maxlen:
+            self.floor = self.replay[0].seq
+        self.replay.append(event)
+
+
+class InProcessBroker:
+    """
+    Pub/sub with a bounded replay buffer per channel.
+
+    Event ids are "<epoch>-<seq>": the epoch changes with every process, so a
+    Last-Event-ID from another process (or one that has already fallen out of
+    the replay buffer) is answered with a `reset` event telling the client to
+    refetch instead of silently missing updates.
+    """
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self.counter = itertools.count(1)
+        self.last_seq = 0
+        self.channels = OrderedDict()
+        self.lock = threading.Lock()
+        self.replay_size = settings.EVENTS_REPLAY_BUFFER
+        self.queue_size = settings.EVENTS_SUBSCRIBER_QUEUE
+        self.max_channels = settings.EVENTS_MAX_CHANNELS
+
+    def _channel(self, name):
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = self.channels[name] = Channel(self.replay_size, self.last_seq)
+            self._evict()
+        else:
+            self.channels.move_to_end(name)
+        return channel
+
+    def _evict(self):
+        # Forget the least recently used idle channels (and their replay).
+        for name in list(self.channels):
+            if len(self.channels) <= self.max_channels:
+                break
+            if not self.channels[name].subscribers:
+                del self.channels[name]
+
+    def publish(self, channel_name, event_type, data):
+        """Thread-safe; may be called from sync views."""
+        payload = json.dumps(data, separators=(',', ':'))
+        with self.lock:
+            # A new channel's floor must predate this event, or a subscriber
+            # resuming from just before it would get a spurious reset.
+            channel = self._channel(channel_name)
+            seq = self.last_seq = next(self.counter)
+            event = Event(f"{self.epoch}-{seq}", seq, event_type, payload)
+            channel.append(event)
+            subscribers = list(channel.subscribers)
+        for sub in subscribers:
+            sub.loop.call_soon_threadsafe(sub.offer, event)
+
+    def _backlog(self, channel, last_event_id):
+        """Events published after `last_event_id`, or a single `reset` if some were lost."""
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit() or int(seq) < channel.floor:
+            return [Event(f"{self.epoch}-{self.last_seq}", self.last_seq, 'reset', '{}')]
+        return [event for event in channel.replay if event.seq > int(seq)]
+
+    async def subscribe(self, channel_name, last_event_id=None, heartbeat=None):
+        """
+        Yield events for `channel_name`, starting with any missed replay.
+        Yields None whenever `heartbeat` seconds pass without an event, and
+        stops if the subscriber falls too far behind.
+        """
+        sub = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self.lock:
+            channel = self._channel(channel_name)
+            backlog = self._backlog(channel, last_event_id)
+            channel.subscribers.add(sub)
+        try:
+            for event in backlog:
+                yield event
+            while not sub.overflowed:
+                try:
+                    yield await asyncio.wait_for(sub.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self.lock:
+                channel.subscribers.discard(sub)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
+
+
+# -------------------------
+# 📣 PUBLISHING
+# -------------------------
+def publish_post_event(post, event_type, data):
+    """
+    Publish a delta for `post` to its own channel and its category's channel,
+    once the surrounding transaction (if any) has committed.
+    """
+    data = {'post': post.slug, **data}
+    channels = [f"post:{post.slug}"]
+    if post.category_id:
+        channels.append(f"category:{post.category_id}")
+
+    def send():
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, event_type, data)
+
+    transaction.on_commit(send)
+
+
+# -------------------------
+# 🌊 SSE VIEWS
+# -------------------------
+async def _stream(channel_name, last_event_id):
+    yield f"retry: {settings.EVENTS_RETRY_MS}\n\n".encode()
+    subscription = get_broker().subscribe(channel_name, last_event_id, settings.EVENTS_HEARTBEAT)
+    try:
+        # Ends when the subscriber overflows: the browser reconnects and replays.
+        async for event in subscription:
+            if event is None:
+                # Comment line: keeps proxies from timing out idle streams.
+                yield b": keepalive\n\n"
+            else:
+                yield event.encode()
+    finally:
+        # Unsubscribe right away when the client disconnects.
+        await subscription.aclose()
+
+
+def asgi_only(view):
+    """Refuse event streams unless the request came in through ASGI."""
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(
+                'Live updates need an ASGI server; see shop/asgi.py.',
+                status=503, content_type='text/plain',
+            )
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def _event_response(request, channel_name):
+    response = StreamingHttpResponse(
+        _stream(channel_name, request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+
+@require_safe
+@asgi_only
+async def post_events(request, slug):
+    """Live `like`, `comment` and `comment_deleted` deltas for one post."""
+    if not await Post.objects.filter(slug=slug).aexists():
+        raise Http404('Post not found')
+    return _event_response(request, f"post:{slug}")
+
+
+@require_safe
+@asgi_only
+async def category_events(request, slug):
+    """Live deltas for every post in a category."""
+    category = await Category.objects.filter(slug=slug).values('id').afirst()
+    if category is None:
+        raise Http404('Category not found')
+    return _event_response(request, f"category:{category['id']}")
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import ArchivedComment, Comment
+
+ARCHIVED_FIELDS = ['id', 'post_id', 'author_id', 'body', 'created_at', 'approved', 'deleted_at']
+
+
+class Command(BaseCommand):
+    help = 'Move old soft-deleted or unapproved comments to the archive table in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30,
+                            help='Archive comments deleted (or left unapproved) more than this many days ago.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        candidates = Comment.all_objects.filter(
+            Q(deleted_at__lt=cutoff) | Q(approved=False, created_at__lt=cutoff)
+        ).order_by('pk')
+
+        if options['dry_run']:
+            self.stdout.write(f'{candidates.count()} comments would be archived.')
+            return
+
+        total = 0
+        last_pk = 0
+        while True:
+            # Keyset pagination keeps every batch an index range scan on the pk.
+            with transaction.atomic():
+                rows = list(candidates.filter(pk__gt=last_pk).values(*ARCHIVED_FIELDS)[:options['batch_size']])
+                if not rows:
+                    break
+                ids = [row.pop('id') for row in rows]
+                ArchivedComment.objects.bulk_create(
+                    [ArchivedComment(original_id=pk, **row) for pk, row in zip(ids, rows)],
+                    ignore_conflicts=True,  # safe to re-run after an interrupted batch
+                )
+                Comment.all_objects.filter(pk__in=ids).delete()
+            last_pk = ids[-1]
+            total += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} comments.'))
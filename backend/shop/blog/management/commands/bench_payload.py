@@ -0,0 +1,141 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from blog.renderers import FastJSONRenderer
+from shop.middleware import available_codecs
+
+
+SYLLABLES = (
+    'ta ne ri so ka mel vin dor pa lu che sta gra fen ol im ber quo tri '
+    'ex an un re co de pro sh th ing er ly tion ment al ous ive ble'
+).split()
+
+
+def make_vocabulary(rng, size=3000):
+    """Pseudo-words of 1-4 syllables; together with Zipf sampling this gives
+    roughly the repetition profile (and compressibility) of English prose."""
+    vocabulary = set()
+    while len(vocabulary) < size:
+        vocabulary.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return sorted(vocabulary, key=len)  # short words are the frequent ones
+
+
+def make_text(rng, vocabulary, weights, words):
+    sentences, remaining = [], words
+    while remaining > 0:
+        length = min(remaining, rng.randint(6, 24))
+        sentence = rng.choices(vocabulary, weights, k=length)
+        sentences.append(sentence[0].capitalize() + ' ' + ' '.join(sentence[1:]) + rng.choice('..?!'))
+        remaining -= length
+    paragraphs = [' '.join(sentences[i:i + 5]) for i in range(0, len(sentences), 5)]
+    return '\n\n'.join(paragraphs)
+
+
+def build_posts_page(page_size=6, comments_per_post=20, content_words=600, seed=0):
+    """
+    Build a paginated payload shaped exactly like PostViewSet.list output
+    (PostSerializer with nested category + comments), without touching the DB.
+    Text is varied (Zipf-distributed words, random lengths, distinct authors
+    and timestamps) so compressed sizes resemble a real page.
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    now = timezone.now()
+    posts = ReturnList(serializer=None)
+    for i in range(page_size):
+        comments = [
+            {
+                'id': rng.randint(1, 10 ** 6),
+                'author': f'{rng.choice(vocabulary)}{rng.randint(1, 9999)}',
+                'body': make_text(rng, vocabulary, weights, rng.randint(5, 80)),
+                'created_at': (now - timedelta(seconds=rng.randint(0, 10 ** 6))).isoformat(),
+                'approved': True,
+            }
+            for _ in range(comments_per_post)
+        ]
+        title = make_text(rng, vocabulary, weights, rng.randint(3, 9)).rstrip('.?!')
+        posts.append({
+            'id': rng.randint(1, 10 ** 5),
+            'title': title,
+            'slug': slugify(title),
+            'content': make_text(rng, vocabulary, weights, rng.randint(content_words // 2, content_words * 3 // 2)),
+            'author': f'{rng.choice(vocabulary)}{rng.randint(1, 9999)}',
+            'category': {'id': i % 4 + 1, 'name': title.split()[0], 'slug': slugify(title.split()[0])},
+            'published': True,
+            'created_at': (now - timedelta(seconds=rng.randint(0, 10 ** 7))).isoformat(),
+            'updated_at': (now - timedelta(seconds=rng.randint(0, 10 ** 5))).isoformat(),
+            'comments': comments,
+            'is_liked': rng.random() < 0.2,
+            'likes_count': rng.randint(0, 500),
+            'image': None,
+            'image_url': None,
+        })
+    return ReturnDict(
+        {'count': 1000, 'next': 'http://testserver/api/posts/?page=2', 'previous': None, 'results': posts},
+        serializer=None,
+    )
+
+
+def load_posts_page(page_size=6):
+    """The first page of real posts, serialized exactly as PostViewSet.list does."""
+    from blog.serializers import PostSerializer
+    from blog.views import PostViewSet
+
+    posts = PostViewSet.queryset.order_by('-created_at')[:page_size]
+    request = APIRequestFactory().get('/api/posts/', HTTP_HOST='localhost')
+    serializer = PostSerializer(posts, many=True, context={'request': Request(request)})
+    return ReturnDict(
+        {'count': PostViewSet.queryset.count(), 'next': None, 'previous': None, 'results': serializer.data},
+        serializer=None,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Benchmark JSON rendering time and compressed bytes-on-wire for a typical posts page.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+        parser.add_argument('--page-size', type=int, default=6)
+        parser.add_argument('--comments', type=int, default=20)
+        parser.add_argument('--from-db', action='store_true',
+                            help='Render the latest real posts instead of a synthetic page.')
+
+    def handle(self, *args, **options):
+        if options['from_db']:
+            data = load_posts_page(options['page_size'])
+        else:
+            data = build_posts_page(options['page_size'], options['comments'])
+        iterations = options['iterations']
+
+        self.stdout.write(f"Rendering posts page x{iterations}")
+        body = b''
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                body = renderer.render(data, 'application/json')
+            elapsed = (time.perf_counter() - start) / iterations
+            self.stdout.write(
+                f"  {type(renderer).__name__:<18} {elapsed * 1e6:9.1f} us/render  {len(body):8d} bytes"
+            )
+
+        self.stdout.write("Bytes on wire")
+        self.stdout.write(f"  {'identity':<18} {len(body):8d} bytes")
+        for codec in available_codecs():
+            start = time.perf_counter()
+            stream = codec.compressobj()
+            compressed = stream.compress(body) + stream.finish()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"  {codec.name:<18} {len(compressed):8d} bytes  "
+                f"({len(compressed) / len(body):5.1%})  {elapsed * 1e6:9.1f} us"
+            )
@@ -0,0 +1,73 @@
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from blog.related import RelatedIndex, build_index
+
+
+class SyntheticCorpus:
+    """Deterministic Zipf-distributed posts, regenerated on every pass."""
+
+    def __init__(self, posts, words, vocabulary=50_000, categories=50, authors=2_000, seed=0):
+        self.posts, self.words, self.seed = posts, words, seed
+        self.vocabulary = np.array([f"w{i}" for i in range(vocabulary)])
+        self.categories, self.authors = categories, authors
+
+    def __call__(self):
+        rng = np.random.default_rng(self.seed)
+        for post_id in range(1, self.posts + 1):
+            terms = self.vocabulary[(rng.zipf(1.3, self.words) - 1) % len(self.vocabulary)]
+            yield (post_id, ' '.join(terms[:8]), ' '.join(terms),
+                   int(rng.integers(1, self.categories)), int(rng.integers(1, self.authors)))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark related-posts index build time and query latency on a synthetic corpus.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--words', type=int, default=300, help='Words per post.')
+        parser.add_argument('--queries', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        corpus = SyntheticCorpus(options['posts'], options['words'])
+
+        start = time.perf_counter()
+        for _ in corpus():
+            pass
+        generation = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            path = build_index(corpus, directory)
+            # Two passes over the corpus: subtract generating it twice.
+            build = time.perf_counter() - start - 2 * generation
+            size = sum(f.stat().st_size for f in path.iterdir())
+            index = RelatedIndex(path)
+
+            rng = np.random.default_rng(1)
+            latencies = []
+            for post_id in rng.integers(1, options['posts'] + 1, options['queries']):
+                post = SimpleNamespace(id=int(post_id), category_id=1, author_id=1, title='', content='')
+                start = time.perf_counter()
+                index.query(post, k=5)
+                latencies.append(time.perf_counter() - start)
+
+            new_post = SimpleNamespace(id=options['posts'] + 1, category_id=1, author_id=1,
+                                       title='fresh post', content='w1 w2 w3 ' * 100)
+            start = time.perf_counter()
+            index.upsert(new_post)
+            upsert = time.perf_counter() - start
+
+        latencies.sort()
+        ms = [x * 1000 for x in latencies]
+        self.stdout.write(f"{options['posts']} posts x {options['words']} words")
+        self.stdout.write(f"  build            {build:8.1f} s   (index {size / 2**20:.0f} MiB on disk)")
+        self.stdout.write(f"  query p50        {statistics.median(ms):8.2f} ms")
+        self.stdout.write(f"  query p95        {ms[int(len(ms) * 0.95)]:8.2f} ms")
+        self.stdout.write(f"  query p99        {ms[int(len(ms) * 0.99)]:8.2f} ms")
+        self.stdout.write(f"  incremental add  {upsert * 1000:8.2f} ms")
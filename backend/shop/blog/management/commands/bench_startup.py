@@ -0,0 +1,42 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter: what a worker pays before serving its first request.
+BOOT = (
+    "import os, time\n"
+    "t = time.perf_counter()\n"
+    "import django\n"
+    "django.setup()\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+    "boot = time.perf_counter() - t\n"
+    "t = time.perf_counter()\n"
+    "import blog.docs, drf_yasg.views, drf_yasg.generators\n"
+    "print(boot, time.perf_counter() - t)\n"
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure worker cold-start time (django.setup + URLconf load) in fresh interpreters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=20)
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'shop.settings')}
+        boot, docs = [], []
+        for _ in range(options['runs']):
+            out = subprocess.check_output([sys.executable, '-c', BOOT], env=env, cwd=settings.BASE_DIR)
+            b, d = map(float, out.split())
+            boot.append(b)
+            docs.append(d)
+
+        self.stdout.write(f"{options['runs']} runs, min / median:")
+        self.stdout.write(f"  worker boot                 {min(boot) * 1000:7.1f} / {statistics.median(boot) * 1000:7.1f} ms")
+        self.stdout.write(f"  deferred docs tooling       {min(docs) * 1000:7.1f} / {statistics.median(docs) * 1000:7.1f} ms "
+                          f"(paid on the first docs request only)")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from blog.docs import API_VERSION, generate_schema, schema_path
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema once and write it to API_SCHEMA_DIR for the docs views to serve.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default=None,
+            help='Base API URL recorded in the schema (e.g. https://api.example.com/).',
+        )
+
+    def handle(self, *args, **options):
+        content = generate_schema(url=options['url'])
+        path = schema_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_bytes(content)
+        tmp.replace(path)  # atomic swap, running workers never see a partial file
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {API_VERSION} schema ({len(content)} bytes) to {path}'
+        ))
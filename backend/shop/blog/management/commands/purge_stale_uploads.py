@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import ImageUpload
+
+
+class Command(BaseCommand):
+    help = 'Delete chunked image uploads (and their part files) older than IMAGE_UPLOAD_EXPIRY.'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - settings.IMAGE_UPLOAD_EXPIRY
+        stale = ImageUpload.objects.filter(updated_at__lt=cutoff)
+        count = 0
+        for upload in stale.iterator():
+            # Finished images live on in post_images/ and may be shared by posts.
+            upload.part_path.unlink(missing_ok=True)
+            count += 1
+        stale.delete()
+        self.stdout.write(self.style.SUCCESS(f'Removed {count} stale uploads.'))
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_imageupload"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedComment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("original_id", models.BigIntegerField(unique=True)),
+                ("post_id", models.BigIntegerField()),
+                ("author_id", models.BigIntegerField(blank=True, null=True)),
+                ("body", models.TextField()),
+                ("created_at", models.DateTimeField()),
+                ("approved", models.BooleanField()),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("approved", True), ("deleted_at__isnull", True)),
+                fields=["post", "-created_at"],
+                name="comment_live_post_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("approved", True), ("deleted_at__isnull", True)),
+                fields=["-created_at"],
+                name="comment_live_recent_idx",
+            ),
+        ),
+    ]
@@ -1,5 +1,9 @@
+import uuid
+from pathlib import Path
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
 
 # -------------------------
@@ -70,11 +74,27 @@ class Post(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Default ordering of the API list and admin changelist / date hierarchy
+            models.Index(fields=['-created_at'], name='post_created_idx'),
+        ]
 
 
 # -------------------------
 # 💬 COMMENT MODEL
 # -------------------------
+class CommentQuerySet(models.QuerySet):
+    def soft_delete(self):
+        return self.update(deleted_at=timezone.now())
+
+
+class LiveCommentManager(models.Manager.from_queryset(CommentQuerySet)):
+    """Default manager: hides soft-deleted comments everywhere (incl. post.comments)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Comment(models.Model):
     post = models.ForeignKey(
         Post, related_name='comments', on_delete=models.CASCADE
@@ -89,9 +109,92 @@ class Comment(models.Model):
     body = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     approved = models.BooleanField(default=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveCommentManager()
+    all_objects = CommentQuerySet.as_manager()  # includes soft-deleted rows
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Only live, approved comments are indexed for the public listings,
+            # so deleted and moderated rows don't bloat the hot indexes.
+            models.Index(
+                fields=['post', '-created_at'],
+                condition=models.Q(deleted_at__isnull=True, approved=True),
+                name='comment_live_post_idx',
+            ),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(deleted_at__isnull=True, approved=True),
+                name='comment_live_recent_idx',
+            ),
+            # Admin changelist / date hierarchy run over every row (all_objects)
+            models.Index(fields=['-created_at'], name='comment_created_idx'),
+        ]
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
 
     def __str__(self):
         return f"Comment by {self.author} on {self.post}"
+
+
+# -------------------------
+# 🗄️ ARCHIVED COMMENT MODEL
+# -------------------------
+class ArchivedComment(models.Model):
+    """
+    Cold storage for old deleted / unapproved comments, filled by the
+    `archive_comments` command. Plain id columns (no foreign keys) keep the
+    archive from constraining or indexing against the hot tables.
+    """
+    original_id = models.BigIntegerField(unique=True)
+    post_id = models.BigIntegerField()
+    author_id = models.BigIntegerField(null=True, blank=True)
+    body = models.TextField()
+    created_at = models.DateTimeField()
+    approved = models.BooleanField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived comment {self.original_id} on post {self.post_id}"
+
+
+# -------------------------
+# 📤 IMAGE UPLOAD MODEL
+# -------------------------
+class ImageUpload(models.Model):
+    """
+    A chunked / resumable post image upload.
+
+    Bytes are appended to a part file under IMAGE_UPLOAD_TEMP_DIR until
+    `offset` reaches `size`; the finished image is then moved into
+    content-addressed storage and referenced by `image`.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='image_uploads', on_delete=models.CASCADE
+    )
+    filename = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    format = models.CharField(max_length=10, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    image = models.ImageField(upload_to='post_images/', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def complete(self):
+        return bool(self.image)
+
+    @property
+    def part_path(self):
+        return Path(settings.IMAGE_UPLOAD_TEMP_DIR) / f"{self.id}.part"
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.offset}/{self.size})"
@@ -0,0 +1,270 @@
+"""
+Related posts from a precomputed, memory-mapped similarity index.
+
+`manage.py build_related_index` turns every published post into a signed,
+hashed TF-IDF term vector (L2-normalised) and writes the vectors plus post /
+category / author ids as .npy files. Workers open them with `mmap_mode`, so
+all processes share one copy through the page cache, and a query is a single
+BLAS mat-vec product followed by a top-k partition.
+
+Saves and deletes update rows in place (see blog/signals.py); newly published
+posts are appended into spare capacity reserved at build time. Term weights
+(IDF) are frozen at build time, so rebuild periodically to refresh them.
+"""
+import json
+import logging
+import re
+import shutil
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: only serialise writers within this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+STOP_WORDS = frozenset(
+    "an and are as at be but by for from has have he her his if in into is it its "
+    "not of on or our she so than that the their them then there these they this "
+    "to was we were what when which who will with you your".split()
+)
+TITLE_WEIGHT = 3  # title terms count as if they appeared this many times
+DF_BUCKETS = 1 << 20  # hashed vocabulary size used for document frequencies
+CURRENT = "CURRENT"
+ARRAYS = ("vectors", "ids", "categories", "authors", "live", "count")
+
+
+# -------------------------
+# 🔤 HASHED TF-IDF
+# -------------------------
+def term_counts(title, content):
+    counts = Counter(t for t in TOKEN_RE.findall(content.lower()) if t not in STOP_WORDS)
+    for term in TOKEN_RE.findall(title.lower()):
+        if term not in STOP_WORDS:
+            counts[term] += TITLE_WEIGHT
+    return counts
+
+
+class TermHasher:
+    """
+    Maps a term to (df bucket, vector dimension, sign) with stable CRC32
+    hashes (Python's hash() differs between processes). The signed hashing
+    trick keeps inner products unbiased despite collisions.
+    """
+    cache_limit = 1_000_000
+
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+        self.cache = {}
+
+    def lookup(self, term):
+        entry = self.cache.get(term)
+        if entry is None:
+            data = term.encode()
+            h1 = zlib.crc32(data)
+            h2 = zlib.crc32(data, 0x9E3779B9)
+            entry = (h1 & (DF_BUCKETS - 1), (h2 >> 1) % self.dimensions, 1.0 if h2 & 1 else -1.0)
+            if len(self.cache) < self.cache_limit:
+                self.cache[term] = entry
+        return entry
+
+    def buckets(self, counts):
+        return np.fromiter((self.lookup(t)[0] for t in counts), np.int64, len(counts))
+
+    def vectorize(self, counts, idf):
+        vector = np.zeros(self.dimensions, np.float32)
+        if not counts:
+            return vector
+        buckets, dims, signs = (np.array(col) for col in zip(*map(self.lookup, counts)))
+        tf = 1.0 + np.log(np.fromiter(counts.values(), np.float32, len(counts)))
+        vector += np.bincount(dims, weights=tf * idf[buckets] * signs, minlength=self.dimensions)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
+
+
+# -------------------------
+# 🏗️ BUILD
+# -------------------------
+def build_index(rows, directory=None, dimensions=None):
+    """
+    Build a new index from `rows`, a callable returning an iterable of
+    (id, title, content, category_id, author_id) ordered by id. It is called
+    twice (document frequencies, then vectors) so posts are never all held in
+    memory. The new build is activated atomically; returns its path.
+    """
+    directory = Path(directory or settings.RELATED_INDEX_DIR)
+    dimensions = dimensions or settings.RELATED_INDEX_DIMENSIONS
+    hasher = TermHasher(dimensions)
+
+    # Pass 1: document frequency per hashed term.
+    df = np.zeros(DF_BUCKETS, np.int64)
+    documents = 0
+    for _, title, content, _, _ in rows():
+        df[hasher.buckets(term_counts(title, content))] += 1
+        documents += 1
+    idf = (np.log((1.0 + documents) / (1.0 + df)) + 1.0).astype(np.float32)
+
+    # Pass 2: vectors, written straight into the memory-mapped files.
+    build = directory / f"build-{time.time_ns()}"
+    build.mkdir(parents=True)
+    capacity = int(documents * 1.25) + 1024  # headroom for incremental appends
+    arrays = _create_arrays(build, capacity, dimensions)
+    row = 0
+    for post_id, title, content, category_id, author_id in rows():
+        arrays["vectors"][row] = hasher.vectorize(term_counts(title, content), idf)
+        arrays["ids"][row] = post_id
+        arrays["categories"][row] = category_id or -1
+        arrays["authors"][row] = author_id or -1
+        arrays["live"][row] = 1
+        row += 1
+    arrays["count"][0] = row
+    for array in arrays.values():
+        array.flush()
+    np.save(build / "idf.npy", idf)
+    (build / "meta.json").write_text(json.dumps({
+        "dimensions": dimensions, "documents": row, "capacity": capacity, "built_at": time.time(),
+    }))
+
+    # Activate: workers notice CURRENT changing and reopen. Older builds can be
+    # unlinked right away; processes that still map them keep the inode alive.
+    tmp = directory / f"{CURRENT}.tmp"
+    tmp.write_text(build.name)
+    tmp.replace(directory / CURRENT)
+    for old in directory.glob("build-*"):
+        if old != build:
+            shutil.rmtree(old, ignore_errors=True)
+    return build
+
+
+def _create_arrays(build, capacity, dimensions):
+    shapes = {
+        "vectors": ((capacity, dimensions), np.float32),
+        "ids": ((capacity,), np.int64),
+        "categories": ((capacity,), np.int64),
+        "authors": ((capacity,), np.int64),
+        "live": ((capacity,), np.uint8),
+        "count": ((1,), np.int64),
+    }
+    return {
+        name: np.lib.format.open_memmap(build / f"{name}.npy", mode="w+", dtype=dtype, shape=shape)
+        for name, (shape, dtype) in shapes.items()
+    }
+
+
+# -------------------------
+# 🔎 QUERY & INCREMENTAL UPDATES
+# -------------------------
+class RelatedIndex:
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        self.capacity = meta["capacity"]
+        self.idf = np.load(self.path / "idf.npy", mmap_mode="r")
+        self.hasher = TermHasher(meta["dimensions"])
+        self.arrays = self._open("r")
+        self._writable = None
+        self._lock = threading.Lock()
+
+    def _open(self, mode):
+        return {name: np.load(self.path / f"{name}.npy", mmap_mode=mode) for name in ARRAYS}
+
+    @property
+    def count(self):
+        return int(self.arrays["count"][0])
+
+    def row_of(self, post_id):
+        rows = np.flatnonzero(self.arrays["ids"][:self.count] == post_id)
+        return int(rows[0]) if len(rows) else None
+
+    def vectorize(self, title, content):
+        return self.hasher.vectorize(term_counts(title, content), self.idf)
+
+    def query(self, post, k=5):
+        """Return up to `k` (post_id, score) pairs most similar to `post`."""
+        n = self.count
+        vectors = self.arrays["vectors"][:n]
+        row = self.row_of(post.id)
+        vector = vectors[row] if row is not None else self.vectorize(post.title, post.content)
+
+        scores = vectors @ vector
+        if post.category_id:
+            scores += settings.RELATED_CATEGORY_BOOST * (self.arrays["categories"][:n] == post.category_id)
+        scores += settings.RELATED_AUTHOR_BOOST * (self.arrays["authors"][:n] == post.author_id)
+        scores[self.arrays["live"][:n] == 0] = -np.inf
+        if row is not None:
+            scores[row] = -np.inf
+
+        k = min(k, n)
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        ids = self.arrays["ids"]
+        return [(int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    @contextmanager
+    def _write(self):
+        with self._lock, open(self.path / "lock", "a") as lockfile:
+            if fcntl is not None:
+                fcntl.flock(lockfile, fcntl.LOCK_EX)
+            if self._writable is None:
+                self._writable = self._open("r+")
+            yield self._writable
+
+    def upsert(self, post):
+        """Add or refresh a published post. Returns False if the index is full."""
+        vector = self.vectorize(post.title, post.content)
+        with self._write() as arrays:
+            row = self.row_of(post.id)
+            if row is None:
+                row = self.count
+                if row >= self.capacity:
+                    logger.warning("Related posts index is full; run `manage.py build_related_index`.")
+                    return False
+            arrays["vectors"][row] = vector
+            arrays["ids"][row] = post.id
+            arrays["categories"][row] = post.category_id or -1
+            arrays["authors"][row] = post.author_id or -1
+            arrays["live"][row] = 1
+            # Publish the new row to readers last.
+            arrays["count"][0] = max(self.count, row + 1)
+        return True
+
+    def remove(self, post_id):
+        with self._write() as arrays:
+            row = self.row_of(post_id)
+            if row is not None:
+                arrays["live"][row] = 0
+
+
+_index = None
+_index_stamp = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """The active index for this process, or None if none has been built."""
+    global _index, _index_stamp
+    current = Path(settings.RELATED_INDEX_DIR) / CURRENT
+    try:
+        stamp = current.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _index is None or _index_stamp != stamp:
+        with _index_lock:
+            if _index is None or _index_stamp != stamp:
+                _index = RelatedIndex(current.parent / current.read_text().strip())
+                _index_stamp = stamp
+    return _index
@@ -0,0 +1,41 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to DRF's stdlib renderer
+    orjson = None
+
+
+# -------------------------
+# ⚡ FAST JSON RENDERER
+# -------------------------
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+
+    Output matches the stdlib renderer for compact responses: datetimes,
+    decimals, UUIDs and lazy strings are routed through DRF's JSONEncoder.
+    Indented or ASCII-escaped output (browsable API, `indent=4`) and
+    environments without orjson use the stdlib implementation.
+
+    One difference: NaN and infinite floats render as `null`, where the
+    strict stdlib renderer raises ValueError. orjson cannot refuse them and
+    checking every float would cost more than the renderer saves.
+    """
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+
+        # ✅ Keep the output a strict javascript subset, same as JSONRenderer
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1,5 +1,7 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Post, Category, Comment
+from .models import Post, Category, Comment, ImageUpload
+from .uploads import check_header, check_size, probe_image, store_post_image
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -26,6 +28,47 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'author', 'approved']
 
 
+# -------------------------
+# 🖼️ BOUNDED IMAGE FIELD
+# -------------------------
+class BoundedImageField(serializers.ImageField):
+    """
+    ImageField that enforces byte and pixel limits from the file size and
+    image header before Pillow's full verification pass runs.
+    """
+
+    def to_internal_value(self, data):
+        if hasattr(data, 'size') and hasattr(data, 'seek'):
+            check_size(data.size)
+            check_header(probe_image(data))
+        return super().to_internal_value(data)
+
+
+# -------------------------
+# 📤 IMAGE UPLOAD SERIALIZER
+# -------------------------
+class ImageUploadSerializer(serializers.ModelSerializer):
+    complete = serializers.BooleanField(read_only=True)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImageUpload
+        fields = [
+            'id', 'filename', 'size', 'offset', 'chunk_size',
+            'format', 'width', 'height', 'image', 'complete',
+        ]
+        read_only_fields = ['id', 'offset', 'format', 'width', 'height', 'image', 'complete']
+
+    def get_chunk_size(self, obj):
+        return settings.POST_IMAGE_CHUNK_SIZE
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('Size must be positive.')
+        check_size(value)
+        return value
+
+
 # -------------------------
 # 📰 POST SERIALIZER (Main)
 # -------------------------
@@ -42,8 +85,11 @@ class PostSerializer(serializers.ModelSerializer):
     is_liked = serializers.SerializerMethodField()
     likes_count = serializers.SerializerMethodField()
 
-    # ✅ Image fields
-    image = serializers.ImageField(required=False, allow_null=True)
+    # ✅ Image fields (either a multipart `image` or a finished chunked `upload_id`)
+    image = BoundedImageField(required=False, allow_null=True)
+    upload_id = serializers.PrimaryKeyRelatedField(
+        queryset=ImageUpload.objects.all(), write_only=True, required=False
+    )
     image_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -53,7 +99,7 @@ class PostSerializer(serializers.ModelSerializer):
             'category', 'category_id', 'published',
             'created_at', 'updated_at',
             'comments', 'is_liked', 'likes_count',
-            'image', 'image_url',  # ✅ added image support
+            'image', 'image_url', 'upload_id',  # ✅ added image support
         ]
         read_only_fields = [
             'id', 'slug', 'author', 'created_at',
@@ -76,12 +122,50 @@ class PostSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.image.url) if request else obj.image.url
         return None
 
+    # ✅ Only the uploader may attach a finished chunked upload
+    def validate_upload_id(self, upload):
+        if upload.owner_id != self.context['request'].user.id:
+            raise serializers.ValidationError('Invalid upload.')
+        if not upload.complete:
+            raise serializers.ValidationError('Upload is not complete yet.')
+        return upload
+
+    # ✅ Store images under their content hash so duplicates share one file
+    def _resolve_image(self, validated_data):
+        upload = validated_data.pop('upload_id', None)
+        if upload is not None:
+            validated_data['image'] = upload.image.name
+        elif validated_data.get('image'):
+            image = validated_data['image']
+            validated_data['image'] = store_post_image(image, image.image.format)
+
     # ✅ Ensure post author is always the logged-in user
     def create(self, validated_data):
         validated_data['author'] = self.context['request'].user
+        self._resolve_image(validated_data)
         return super().create(validated_data)
 
     # ✅ Prevent author from being changed accidentally
     def update(self, instance, validated_data):
         validated_data.pop('author', None)
+        self._resolve_image(validated_data)
         return super().update(instance, validated_data)
+
+
+# -------------------------
+# 🔗 RELATED POST SERIALIZER (compact)
+# -------------------------
+class RelatedPostSerializer(serializers.ModelSerializer):
+    author = serializers.StringRelatedField(read_only=True)
+    category = CategorySerializer(read_only=True)
+    image_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Post
+        fields = ['id', 'title', 'slug', 'author', 'category', 'created_at', 'image_url']
+
+    def get_image_url(self, obj):
+        if obj.image:
+            request = self.context.get('request')
+            return request.build_absolute_uri(obj.image.url) if request else obj.image.url
+        return None
@@ -0,0 +1,40 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Post
+
+# Saves touching only other fields (e.g. view_count) don't affect similarity.
+INDEXED_FIELDS = {'title', 'content', 'category', 'author', 'published'}
+
+
+def _sync_related_index(post_id):
+    from .related import get_index  # keeps numpy out of worker startup
+
+    index = get_index()
+    if index is None:
+        return
+    post = Post.objects.filter(pk=post_id).only(
+        'id', 'title', 'content', 'category_id', 'author_id', 'published'
+    ).first()
+    if post is not None and post.published:
+        index.upsert(post)
+    else:
+        index.remove(post_id)
+
+
+# ✅ Keep the related-posts index current as posts are published or edited
+@receiver(post_save, sender=Post)
+def update_related_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(partial(_sync_related_index, instance.pk))
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_related_index(sender, instance, **kwargs):
+    # Bind the pk now: Django sets it to None once the delete finishes,
+    # before an outer transaction (admin delete views) commits.
+    transaction.on_commit(partial(_sync_related_index, instance.pk))
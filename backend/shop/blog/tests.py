@@ -1,3 +1,950 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+from urllib.parse import quote
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy
+import numpy as np
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from shop.middleware import CompressionMiddleware, brotli, parse_accept_encoding, zstandard
+
+from . import docs
+from .events import InProcessBroker
+from .renderers import FastJSONRenderer, orjson
+from .models import ArchivedComment, Category, Comment, ImageUpload, Post
+from .views import ImageUploadViewSet
+
+User = get_user_model()
+
+
+# -------------------------
+# 🛠 ADMIN QUERY COUNTS
+# -------------------------
+# The manifest storage needs `collectstatic` output, which tests don't have.
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class AdminChangelistQueryTests(TestCase):
+    """
+    Changelist query counts must not grow with the number of rows shown
+    (no per-row author / category / post lookups).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_rows(self, count):
+        start = Post.objects.count()
+        for i in range(start, start + count):
+            author = User.objects.create_user(f'author{i}')
+            category = Category.objects.create(name=f'Category {i}')
+            post = Post.objects.create(author=author, category=category, title=f'Post {i}', content='...')
+            Comment.objects.create(post=post, author=author, body='Nice post')
+
+    def count_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, url, **params):
+        self.add_rows(2)
+        few = self.count_queries(url, **params)
+        self.add_rows(10)
+        many = self.count_queries(url, **params)
+        self.assertEqual(few, many)
+
+    def test_post_changelist(self):
+        self.assertConstantQueries(reverse('admin:blog_post_changelist'))
+
+    def test_post_changelist_filtered(self):
+        self.assertConstantQueries(reverse('admin:blog_post_changelist'), published='0')
+
+    def test_post_changelist_search(self):
+        url = reverse('admin:blog_post_changelist')
+        self.assertConstantQueries(url, q='Post 1')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'q': 'Post 1'})
+        self.assertContains(response, 'Post 1')
+        # Index-friendly search: slug prefix match, never a leading wildcard
+        sql = ' '.join(q['sql'] for q in ctx.captured_queries)
+        self.assertIn("LIKE 'post-1%'", sql)
+        self.assertNotIn("LIKE '%", sql)
+
+    def test_comment_changelist(self):
+        self.assertConstantQueries(reverse('admin:blog_comment_changelist'))
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+    def test_comment_changelist_uses_created_index(self):
+        # Query counts miss a full scan + sort; check the plan of the page query
+        self.add_rows(3)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('admin:blog_comment_changelist'))
+        page_sql = next(
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT "blog_comment"."id"') and 'ORDER BY' in q['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + page_sql)
+            plan = [row[-1] for row in cursor.fetchall()]
+        self.assertIn('SCAN blog_comment USING INDEX comment_created_idx', plan)
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_post_change_page_does_not_list_users(self):
+        self.add_rows(1)
+        post = Post.objects.first()
+        post.likes.add(*User.objects.all())
+        url = reverse('admin:blog_post_change', args=[post.pk])
+        self.count_queries(url)  # warm the content type cache
+        before = self.count_queries(url)
+        for i in range(20):
+            User.objects.create_user(f'reader{i}')
+        self.assertEqual(self.count_queries(url), before)
+        self.assertNotContains(self.client.get(url), 'reader19')
+
+
+# -------------------------
+# 💬 SOFT DELETE & ARCHIVING
+# -------------------------
+class SoftDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author')
+        cls.post = Post.objects.create(author=cls.author, title='Post', content='...')
+
+    def comment(self, age_days=0, deleted_days=None, approved=True):
+        comment = Comment.objects.create(post=self.post, author=self.author, body='Hi', approved=approved)
+        now = timezone.now()
+        Comment.all_objects.filter(pk=comment.pk).update(
+            created_at=now - timedelta(days=age_days),
+            deleted_at=None if deleted_days is None else now - timedelta(days=deleted_days),
+        )
+        return comment
+
+    def archive(self, **options):
+        out = StringIO()
+        call_command('archive_comments', stdout=out, **options)
+        return out.getvalue()
+
+    def test_default_manager_hides_deleted_comments(self):
+        live = self.comment()
+        deleted = self.comment()
+        deleted.soft_delete()
+        self.assertEqual(list(self.post.comments.all()), [live])
+        self.assertEqual(list(Comment.objects.all()), [live])
+        self.assertEqual(Comment.all_objects.count(), 2)
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_admin_lists_and_restores_deleted_comments(self):
+        deleted = self.comment(deleted_days=1)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        url = reverse('admin:blog_comment_changelist')
+        response = self.client.get(url, {'deleted_at__isempty': '0'})
+        self.assertEqual(list(response.context['cl'].result_list), [deleted])
+        self.client.post(url, {'action': 'restore_comments', '_selected_action': [deleted.pk]})
+        self.assertEqual(list(self.post.comments.all()), [deleted])
+
+    def test_archive_moves_old_rows_in_batches(self):
+        old = [self.comment(age_days=60, deleted_days=45) for _ in range(3)]
+        old += [self.comment(age_days=60, approved=False) for _ in range(2)]
+        recent_deleted = self.comment(deleted_days=1)
+        live = self.comment(age_days=60)
+
+        with CaptureQueriesContext(connection) as ctx:
+            output = self.archive(batch_size=2)
+        self.assertIn('Archived 5 comments', output)
+        # 5 rows in batches of 2 -> 3 batch deletes
+        deletes = [q for q in ctx.captured_queries if q['sql'].startswith('DELETE FROM "blog_comment"')]
+        self.assertEqual(len(deletes), 3)
+
+        self.assertEqual(
+            sorted(ArchivedComment.objects.values_list('original_id', flat=True)),
+            sorted(c.pk for c in old),
+        )
+        self.assertEqual(
+            sorted(Comment.all_objects.values_list('pk', flat=True)),
+            sorted([recent_deleted.pk, live.pk]),
+        )
+
+    def test_archive_is_idempotent(self):
+        comment = self.comment(age_days=60, deleted_days=45)
+        # A row already copied by an earlier, interrupted run
+        ArchivedComment.objects.create(
+            original_id=comment.pk, post_id=self.post.pk, author_id=self.author.pk, body='Hi',
+            created_at=comment.created_at, approved=True, deleted_at=timezone.now(),
+        )
+        self.assertIn('Archived 1 comments', self.archive(batch_size=2))
+        self.assertIn('Archived 0 comments', self.archive(batch_size=2))
+        self.assertEqual(ArchivedComment.objects.count(), 1)
+        self.assertFalse(Comment.all_objects.exists())
+
+
+# -------------------------
+# 📡 LIVE EVENTS
+# -------------------------
+@override_settings(EVENTS_REPLAY_BUFFER=3, EVENTS_SUBSCRIBER_QUEUE=2)
+class InProcessBrokerTests(SimpleTestCase):
+    heartbeat = 0.05
+
+    def setUp(self):
+        self.broker = InProcessBroker()
+
+    def publish(self, count, channel='post:a'):
+        for i in range(count):
+            self.broker.publish(channel, 'like', {'n': i})
+        return [event.id for event in self.broker.channels[channel].replay]
+
+    async def receive(self, subscription, limit=10):
+        """Events until the first heartbeat (None) or the end of the stream."""
+        events = []
+        async for event in subscription:
+            if event is None or len(events) == limit:
+                break
+            events.append(event)
+        return events
+
+    async def resume(self, last_event_id):
+        subscription = self.broker.subscribe('post:a', last_event_id, self.heartbeat)
+        try:
+            return await self.receive(subscription)
+        finally:
+            await subscription.aclose()
+
+    async def test_resume_from_last_event_id(self):
+        ids = self.publish(3)
+        events = await self.resume(ids[0])
+        self.assertEqual([e.id for e in events], ids[1:])
+        self.assertEqual(await self.resume(ids[-1]), [])
+
+    async def test_resume_at_replay_boundary(self):
+        # `first` has been evicted, but everything after it is still buffered:
+        # nothing was lost, so no reset.
+        first = self.publish(1)[0]
+        ids = self.publish(3)
+        events = await self.resume(first)
+        self.assertEqual([e.id for e in events], ids)
+
+    async def test_reset_when_events_were_evicted(self):
+        first = self.publish(1)[0]
+        self.publish(4)  # pushes `first` and the event after it out of the replay
+        events = await self.resume(first)
+        self.assertEqual([e.type for e in events], ['reset'])
+
+    async def test_reset_for_other_epoch_or_garbage(self):
+        seq = self.publish(1)[0].partition('-')[2]
+        for last_event_id in (f'00000000-{seq}', 'garbage', f'{self.broker.epoch}-x'):
+            events = await self.resume(last_event_id)
+            self.assertEqual([e.type for e in events], ['reset'], last_event_id)
+
+    async def test_new_channel_resumes_without_reset(self):
+        # An id from before the channel existed is not a gap for that channel.
+        other = self.publish(1, channel='post:b')[0]
+        ids = self.publish(2)
+        events = await self.resume(other)
+        self.assertEqual([e.id for e in events], ids)
+
+    async def test_slow_subscriber_is_cut_off(self):
+        subscription = self.broker.subscribe('post:a', None, self.heartbeat)
+        self.assertIsNone(await anext(subscription))  # subscribed, idle
+        channel = self.broker.channels['post:a']
+        self.assertEqual(len(channel.subscribers), 1)
+
+        self.publish(5)  # queue holds 2
+        await asyncio.sleep(0)  # let the loop deliver the offers
+        with self.assertRaises(StopAsyncIteration):
+            await anext(subscription)
+        self.assertEqual(channel.subscribers, set())
+
+        # The browser reconnects and catches up from the replay buffer.
+        ids = [e.id for e in channel.replay]
+        events = await self.resume(ids[0])
+        self.assertEqual([e.id for e in events], ids[1:])
+
+    def test_event_streams_refuse_wsgi(self):
+        response = self.client.get(reverse('post-events', args=['anything']))
+        self.assertEqual(response.status_code, 503)
+
+
+# -------------------------
+# 🔗 RELATED POSTS INDEX
+# -------------------------
+@override_settings(RELATED_INDEX_DIR=tempfile.mkdtemp())
+class RelatedIndexSyncTests(TestCase):
+    def setUp(self):
+        from .related import get_index
+
+        author = User.objects.create_user('author')
+        self.posts = [
+            Post.objects.create(author=author, title=f'Django caching {i}', content='cache views', published=True)
+            for i in range(3)
+        ]
+        call_command('build_related_index', stdout=StringIO())
+        self.index = get_index()
+
+    def related_ids(self):
+        return [post_id for post_id, _ in self.index.query(self.posts[0], k=5)]
+
+    def test_delete_inside_outer_transaction(self):
+        doomed = self.posts[1]
+        doomed_pk = doomed.pk
+        self.assertIn(doomed_pk, self.related_ids())
+        # Like the admin delete views: the pk is None by the time this commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                doomed.delete()
+        self.assertNotIn(doomed_pk, self.related_ids())
+
+    def test_publish_appends_into_reserved_capacity(self):
+        count = self.index.count
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = Post.objects.create(author=self.posts[0].author, title='Django caching draft', content='cache views')
+        self.assertEqual(self.index.count, count)  # drafts stay out
+
+        draft.published = True
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.save()
+        self.assertEqual(self.index.count, count + 1)
+        self.assertEqual(self.index.row_of(draft.pk), count)
+        self.assertIn(draft.pk, self.related_ids())
+
+    def test_edit_updates_row_in_place(self):
+        post = self.posts[1]
+        row = self.index.row_of(post.pk)
+        post.title, post.content = 'Gardening', 'tomatoes in raised beds'
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+        self.assertEqual(self.index.row_of(post.pk), row)
+        self.assertEqual(self.index.count, len(self.posts))
+        self.assertTrue(np.allclose(self.index.arrays['vectors'][row], self.index.vectorize(post.title, post.content)))
+
+    def test_unrelated_field_save_is_ignored(self):
+        with mock.patch.object(self.index, 'upsert') as upsert, self.captureOnCommitCallbacks(execute=True):
+            Post.objects.get(pk=self.posts[0].pk).save(update_fields=['view_count'])
+        upsert.assert_not_called()
+
+    def test_unpublish_removes(self):
+        post = self.posts[1]
+        post.published = False
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+        self.assertNotIn(post.pk, self.related_ids())
+
+    def test_full_index_rejects_new_posts(self):
+        self.index.capacity = self.index.count
+        with self.assertLogs('blog.related', 'WARNING') as logs, self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(author=self.posts[0].author, title='Django caching 3', content='cache views',
+                                       published=True)
+        self.assertIn('index is full', logs.output[0])
+        self.assertIsNone(self.index.row_of(post.pk))
+        self.assertEqual(self.index.count, len(self.posts))
+        with self.assertLogs('blog.related', 'WARNING'):
+            self.assertFalse(self.index.upsert(post))
+        # Existing rows can still be refreshed.
+        self.assertTrue(self.index.upsert(self.posts[0]))
+
+
+@override_settings(RELATED_INDEX_DIR=tempfile.mkdtemp())
+class RelatedPostsEndpointTests(TestCase):
+    """GET /api/posts/<slug>/related/, ranked by the index or the category fallback."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author')
+        other_author = User.objects.create_user('other')
+        backend = Category.objects.create(name='Backend')
+        other = Category.objects.create(name='Other')
+
+        def post(author, category, title, content, published=True):
+            return Post.objects.create(author=author, category=category, title=title, content=content,
+                                       published=published)
+
+        cls.post = post(cls.author, backend, 'Django caching', 'cache views with redis and memcached')
+        cls.similar = post(other_author, other, 'Caching Django views', 'redis and memcached cache views')
+        # Identical text, so only the category / author boosts tell them apart.
+        cls.same_category = post(other_author, backend, 'Gardening', 'tomatoes in raised beds')
+        cls.same_author = post(cls.author, other, 'Gardening', 'tomatoes in raised beds')
+        cls.unrelated = post(other_author, other, 'Gardening', 'tomatoes in raised beds')
+        cls.draft = post(cls.author, backend, 'Django caching draft', 'cache views with redis', published=False)
+
+    def build(self):
+        from .related import get_index
+
+        call_command('build_related_index', stdout=StringIO())
+        return get_index()
+
+    def related(self, **params):
+        response = self.client.get(reverse('post-related', args=[self.post.slug]), params)
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.json()]
+
+    def test_ranking_and_boosts(self):
+        index = self.build()
+        self.assertEqual(
+            self.related(),
+            [self.similar.pk, self.same_category.pk, self.same_author.pk, self.unrelated.pk],
+        )
+        scores = dict(index.query(self.post, k=5))
+        self.assertAlmostEqual(scores[self.same_category.pk] - scores[self.unrelated.pk], 0.15, places=5)
+        self.assertAlmostEqual(scores[self.same_author.pk] - scores[self.unrelated.pk], 0.05, places=5)
+
+    def test_excludes_the_post_itself(self):
+        # Even an exact duplicate ranks, but never the post it is related to.
+        twin = Post.objects.create(author=self.author, title=self.post.title, content=self.post.content,
+                                   published=True)
+        self.build()
+        ids = self.related()
+        self.assertEqual(ids[0], twin.pk)
+        self.assertNotIn(self.post.pk, ids)
+        self.assertNotIn(self.draft.pk, ids)
+
+    def test_limit_is_clamped(self):
+        for i in range(25):
+            Post.objects.create(author=self.author, title=f'Cooking {i}', content='pasta', published=True)
+        self.build()
+        self.assertEqual(len(self.related(limit=0)), 1)
+        self.assertEqual(len(self.related(limit=2)), 2)
+        self.assertEqual(len(self.related(limit=50)), 20)
+        self.assertEqual(len(self.related(limit='abc')), 5)
+        self.assertEqual(len(self.related()), 5)
+
+    @override_settings(RELATED_INDEX_DIR=tempfile.mkdtemp())
+    def test_falls_back_to_category_without_index(self):
+        newer = Post.objects.create(author=self.author, category=self.post.category, title='Newer', content='...',
+                                    published=True)
+        self.assertEqual(self.related(), [newer.pk, self.same_category.pk])
+        self.assertEqual(self.related(limit=1), [newer.pk])
+
+
+# -------------------------
+# 🗜️ RESPONSE COMPRESSION
+# -------------------------
+def decompress(coding, data):
+    if coding == 'gzip':
+        return gzip.decompress(data)
+    if coding == 'br':
+        return brotli.decompress(data)
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+@skipUnless(brotli and zstandard, 'brotli and zstandard are optional')
+@override_settings(COMPRESSION_MIN_SIZE=512)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"results": [' + b','.join(b'{"id": %d, "title": "Post %d"}' % (i, i) for i in range(100)) + b']}'
+
+    def process(self, response, accept_encoding='gzip, br, zstd'):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding))
+
+    def json_response(self, body=None, **kwargs):
+        return HttpResponse(self.body if body is None else body, content_type='application/json', **kwargs)
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding('gzip;q=0.5, BR , zstd;q=0, deflate;q=abc, '),
+            {'gzip': 0.5, 'br': 1.0, 'zstd': 0.0, 'deflate': 0.0},
+        )
+
+    def test_negotiation(self):
+        middleware = CompressionMiddleware(None)
+        cases = {
+            'gzip, br, zstd': 'zstd',           # server preference breaks ties
+            'gzip, br': 'br',
+            'gzip;q=1, br;q=0.5': 'gzip',       # client qvalues win
+            '*': 'zstd',
+            '*, zstd;q=0': 'br',                # q=0 refuses a coding
+            'gzip;q=0, *;q=0.1': 'zstd',
+            'identity': None,
+            'br;q=0': None,
+            '': None,
+        }
+        for header, expected in cases.items():
+            codec = middleware.select_codec(header)
+            self.assertEqual(codec and codec.name, expected, header)
+
+    def test_compresses_json(self):
+        response = self.process(self.json_response(headers={'ETag': '"abc"'}))
+        self.assertEqual(response['Content-Encoding'], 'zstd')
+        self.assertEqual(decompress('zstd', response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['ETag'], 'W/"abc"')  # strong ETag no longer matches the bytes
+
+    def test_each_codec_round_trips(self):
+        for coding in ('gzip', 'br', 'zstd'):
+            response = self.process(self.json_response(), accept_encoding=coding)
+            self.assertEqual(response['Content-Encoding'], coding)
+            self.assertEqual(decompress(coding, response.content), self.body)
+
+    def test_vary_without_acceptable_coding(self):
+        response = self.process(self.json_response(), accept_encoding='identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.process(self.json_response(b'{"id": 1}'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'{"id": 1}')
+
+    def test_skipped_responses(self):
+        cases = {
+            'html': HttpResponse(self.body, content_type='text/html; charset=utf-8'),
+            'image': HttpResponse(self.body, content_type='image/png'),
+            'event stream': StreamingHttpResponse(iter([self.body]), content_type='text/event-stream'),
+            'not 200': self.json_response(status=206),
+            'no-transform': self.json_response(headers={'Cache-Control': 'no-transform'}),
+            'already encoded': self.json_response(headers={'Content-Encoding': 'gzip'}),
+        }
+        for name, response in cases.items():
+            response = self.process(response)
+            self.assertNotEqual(response.get('Content-Encoding'), 'zstd', name)
+
+    def test_streaming_is_compressed_chunk_by_chunk(self):
+        chunks = [self.body[i:i + 100] for i in range(0, len(self.body), 100)]
+        response = self.process(
+            StreamingHttpResponse(iter(chunks), content_type='text/csv', headers={'Content-Length': '1'}),
+            accept_encoding='gzip',
+        )
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(decompress('gzip', b''.join(response.streaming_content)), self.body)
+
+    async def test_async_streaming(self):
+        async def chunks():
+            for i in range(0, len(self.body), 100):
+                yield self.body[i:i + 100]
+
+        response = self.process(StreamingHttpResponse(chunks(), content_type='application/json'), 'br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        compressed = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(decompress('br', compressed), self.body)
+
+
+@skipUnless(orjson, 'orjson is optional')
+class FastJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_output(self):
+        data = {
+            'datetime': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'naive': datetime(2024, 5, 1, 12, 30),
+            'date': date(2024, 5, 1),
+            'time': time(9, 15, 30, 500000),
+            'duration': timedelta(hours=1, seconds=5),
+            'decimal': Decimal('12.50'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Hello'),
+            'separators': 'line\u2028para\u2029end',
+            'unicode': 'café ✓',
+            1: 'non-string key',
+            'nested': [{'none': None, 'float': 1.5, 'bool': True}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_uses_drf(self):
+        data = {'a': [1, 2]}
+        context = {'indent': 4}
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json', context),
+            JSONRenderer().render(data, 'application/json', context),
+        )
+
+    def test_nan_renders_as_null(self):
+        # Documented difference: the strict stdlib renderer refuses NaN.
+        self.assertEqual(FastJSONRenderer().render({'x': float('nan')}), b'{"x":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({'x': float('nan')})
+
+
+# -------------------------
+# 🖼️ MEDIA SERVING
+# -------------------------
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), MEDIA_SENDFILE_BACKEND=None)
+class ServeMediaTests(SimpleTestCase):
+    data = bytes(range(256)) * 4  # 1024 bytes
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from django.conf import settings
+
+        root = Path(settings.MEDIA_ROOT)
+        (root / 'post_images').mkdir(exist_ok=True)
+        (root / 'post_images' / 'photo.png').write_bytes(cls.data)
+        (root / 'post_images' / 'café photo.png').write_bytes(cls.data)
+        (root / 'empty.txt').write_bytes(b'')
+
+    def get(self, path='post_images/photo.png', **headers):
+        return self.client.get(f'/media/{path}', headers=headers)
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_response(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.data)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+    def test_byte_ranges(self):
+        cases = {
+            'bytes=10-19': (10, 19),
+            'bytes=1000-': (1000, 1023),
+            'bytes=1000-5000': (1000, 1023),  # end clamped to the file
+            'bytes=-24': (1000, 1023),         # suffix
+            'bytes=-5000': (0, 1023),          # suffix longer than the file
+        }
+        for header, (start, end) in cases.items():
+            response = self.get(Range=header)
+            self.assertEqual(response.status_code, 206, header)
+            self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/1024', header)
+            self.assertEqual(response['Content-Length'], str(end - start + 1), header)
+            self.assertEqual(self.body(response), self.data[start:end + 1], header)
+
+    def test_unsatisfiable_ranges(self):
+        for path, header in [
+            ('post_images/photo.png', 'bytes=1024-'),
+            ('post_images/photo.png', 'bytes=20-10'),
+            ('post_images/photo.png', 'bytes=-0'),
+            ('empty.txt', 'bytes=-5'),
+            ('empty.txt', 'bytes=0-'),
+        ]:
+            response = self.get(path, Range=header)
+            self.assertEqual(response.status_code, 416, (path, header))
+            self.assertTrue(response['Content-Range'].startswith('bytes */'), (path, header))
+
+    def test_ignored_ranges_send_the_full_file(self):
+        for header in ('bytes=0-1,5-6', 'items=0-1', 'bytes=-'):
+            response = self.get(Range=header)
+            self.assertEqual(response.status_code, 200, header)
+            self.assertEqual(self.body(response), self.data, header)
+
+    def test_if_range(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(Range='bytes=0-9', If_Range=etag).status_code, 206)
+        response = self.get(Range='bytes=0-9', If_Range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.data)
+
+    def test_conditional_requests(self):
+        first = self.get()
+        etag = first['ETag']
+        self.assertEqual(self.get(If_None_Match=etag).status_code, 304)
+        self.assertEqual(self.get(If_None_Match=f'"other", W/{etag}').status_code, 304)
+        self.assertEqual(self.get(If_None_Match='"other"').status_code, 200)
+        self.assertEqual(self.get(If_Modified_Since=first['Last-Modified']).status_code, 304)
+        self.assertEqual(self.get(If_Modified_Since=http_date(0)).status_code, 200)
+
+    def test_missing_files_and_traversal(self):
+        self.assertEqual(self.get('post_images/missing.png').status_code, 404)
+        self.assertEqual(self.get('post_images').status_code, 404)
+        self.assertEqual(self.get('post_images/photo.png/x').status_code, 404)
+        self.assertEqual(self.get('../shop/settings.py').status_code, 400)
+        self.assertEqual(self.client.post('/media/post_images/photo.png').status_code, 405)
+
+    def test_xsendfile(self):
+        from django.conf import settings
+
+        with self.settings(MEDIA_SENDFILE_BACKEND='xsendfile'):
+            response = self.get('post_images/café photo.png')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        path = Path(settings.MEDIA_ROOT, 'post_images', 'café photo.png')
+        self.assertEqual(response['X-Sendfile'], quote(str(path)))
+        self.assertTrue(response['X-Sendfile'].endswith('/caf%C3%A9%20photo.png'))
+
+    def test_accel_redirect(self):
+        with self.settings(MEDIA_SENDFILE_BACKEND='nginx'):
+            response = self.get('post_images/café photo.png')
+            etag = response['ETag']
+            not_modified = self.get('post_images/café photo.png', If_None_Match=etag)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/post_images/caf%C3%A9%20photo.png')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response.content, b'')
+        self.assertEqual(not_modified.status_code, 304)  # validators are still answered by Django
+
+
+# -------------------------
+# 📤 IMAGE UPLOADS
+# -------------------------
+def png_bytes(width=40, height=30, noise=False):
+    """A PNG; `noise` makes it incompressible (a few KB) so it spans several chunks."""
+    if noise:
+        image = Image.frombytes('RGB', (width, height), random.Random(width * height).randbytes(width * height * 3))
+    else:
+        image = Image.new('RGB', (width, height), 'red')
+    buffer = BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@override_settings(
+    MEDIA_ROOT=tempfile.mkdtemp(),
+    IMAGE_UPLOAD_TEMP_DIR=Path(tempfile.mkdtemp()),
+    POST_IMAGE_MAX_BYTES=20_000,
+    POST_IMAGE_MAX_SIDE=200,
+    POST_IMAGE_MAX_PIXELS=20_000,
+    POST_IMAGE_CHUNK_SIZE=100,
+)
+class ImageUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('uploader')
+        cls.other = User.objects.create_user('other')
+        cls.category = Category.objects.create(name='Photos')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    # --- helpers ---
+    def create_post(self, extra=None, **data):
+        data = {'title': f'Post {Post.objects.count()}', 'content': '...', 'category_id': self.category.pk, **data}
+        return self.client.post(
+            '/api/posts/', data, format='multipart' if 'image' in data else 'json', **(extra or {}),
+        )
+
+    def image_file(self, content=None, name='photo.png'):
+        return SimpleUploadedFile(name, png_bytes() if content is None else content, 'image/png')
+
+    def start(self, data, owner=None):
+        client = self.client
+        if owner is not None:
+            client = APIClient()
+            client.force_authenticate(owner)
+        response = client.post('/api/uploads/', {'filename': 'photo.png', 'size': len(data)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def patch(self, upload_id, chunk, offset, **extra):
+        return self.client.generic(
+            'PATCH', f'/api/uploads/{upload_id}/', chunk,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset), **extra,
+        )
+
+    def upload(self, data):
+        upload_id = self.start(data)
+        for offset in range(0, len(data), 100):
+            response = self.patch(upload_id, data[offset:offset + 100], offset)
+            self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(response.data['complete'])
+        return upload_id
+
+    # --- multipart ---
+    def test_cors_preflight_allows_upload_offset(self):
+        response = self.client.options(
+            '/api/uploads/x/',
+            HTTP_ORIGIN='http://localhost:5173',
+            HTTP_ACCESS_CONTROL_REQUEST_METHOD='PATCH',
+            HTTP_ACCESS_CONTROL_REQUEST_HEADERS='authorization,content-type,upload-offset',
+        )
+        self.assertIn('upload-offset', response['Access-Control-Allow-Headers'])
+
+    def test_identical_images_are_stored_once(self):
+        first = self.create_post(image=self.image_file(name='a.png'))
+        second = self.create_post(image=self.image_file(name='b.png'))
+        self.assertEqual(first.status_code, 201, first.data)
+        names = {post.image.name for post in Post.objects.all()}
+        self.assertEqual(len(names), 1)
+        self.assertRegex(names.pop(), r'^post_images/[0-9a-f]{64}\.png$')
+        self.assertEqual(second.data['image'], first.data['image'])
+
+    def test_request_over_content_length_limit_is_refused(self):
+        from django.conf import settings
+
+        too_big = settings.POST_IMAGE_MAX_BYTES + settings.DATA_UPLOAD_MAX_MEMORY_SIZE + 1
+        response = self.create_post(image=self.image_file(), extra={'CONTENT_LENGTH': str(too_big)})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('too large', str(response.data))
+        self.assertFalse(Post.objects.exists())
+
+    def test_oversized_file_stops_the_upload(self):
+        with mock.patch('django.core.files.uploadhandler.TemporaryFileUploadHandler.receive_data_chunk') as write:
+            response = self.create_post(image=self.image_file(png_bytes(noise=True) + b'\0' * 200_000))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('too large', str(response.data))
+        self.assertFalse(Post.objects.exists())
+        # Nothing past the limit was written, and parsing stopped right there.
+        written = sum(len(call.args[0]) for call in write.call_args_list)
+        self.assertLessEqual(written, 20_000)
+
+    def test_image_limits(self):
+        cases = {
+            'longest side': png_bytes(300, 10),
+            'pixels': png_bytes(150, 150),
+            'not a recognised image': b'GIF89a' + b'x' * 100,
+        }
+        for message, content in cases.items():
+            response = self.create_post(image=self.image_file(content))
+            self.assertEqual(response.status_code, 400, message)
+            self.assertIn(message, str(response.data['image']), message)
+        self.assertFalse(Post.objects.exists())
+
+    # --- chunked / resumable ---
+    def test_chunked_upload_then_attach(self):
+        data = png_bytes(noise=True)
+        upload_id = self.upload(data)
+        upload = ImageUpload.objects.get(pk=upload_id)
+        self.assertEqual((upload.format, upload.width, upload.height), ('PNG', 40, 30))
+        self.assertFalse(upload.part_path.exists())
+
+        response = self.create_post(upload_id=upload_id)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Post.objects.get().image.name, upload.image.name)
+
+        # Same bytes sent as multipart: deduplicated against the chunked upload
+        self.create_post(image=self.image_file(data))
+        self.assertEqual(len({post.image.name for post in Post.objects.all()}), 1)
+
+    def test_stale_offset_conflicts(self):
+        data = png_bytes(noise=True)
+        upload_id = self.start(data)
+        self.patch(upload_id, data[:100], 0)
+        response = self.patch(upload_id, data[:100], 0)  # retry of a chunk that already landed
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 100)
+
+    def test_chunk_limits(self):
+        data = png_bytes(noise=True)
+        upload_id = self.start(data)
+        past_end = self.patch(upload_id, data[:50], len(data) - 10)
+        self.assertEqual(past_end.status_code, 409)  # wrong offset is checked first
+        self.patch(upload_id, data[:100], 0)
+        responses = {
+            400: self.patch(upload_id, b'', 100, CONTENT_LENGTH='0'),
+            413: self.patch(upload_id, data[100:201], 100),
+        }
+        for code, response in responses.items():
+            self.assertEqual(response.status_code, code)
+
+        small = self.start(b'x' * 150)
+        self.patch(small, png_bytes(noise=True)[:100], 0)
+        self.assertEqual(self.patch(small, b'x' * 60, 100).status_code, 400)  # past declared size
+
+    def test_missing_content_length(self):
+        upload_id = self.start(png_bytes(noise=True))
+        request = APIRequestFactory().generic(
+            'PATCH', f'/api/uploads/{upload_id}/', b'abc',
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET='0',
+        )
+        del request.META['CONTENT_LENGTH']  # chunked transfer encoding
+        force_authenticate(request, self.user)
+        response = ImageUploadViewSet.as_view({'patch': 'partial_update'})(request, pk=upload_id)
+        self.assertEqual(response.status_code, 411)
+
+    def test_invalid_image_discards_upload(self):
+        data = b'not an image at all' * 10
+        upload_id = self.start(data)
+        response = self.patch(upload_id, data[:100], 0)
+        response = self.patch(upload_id, data[100:], 100)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImageUpload.objects.filter(pk=upload_id).exists())
+
+    def test_unknown_and_malformed_ids_are_404(self):
+        for upload_id in ('not-a-uuid', uuid.uuid4()):
+            self.assertEqual(self.client.get(f'/api/uploads/{upload_id}/').status_code, 404)
+            self.assertEqual(self.patch(upload_id, b'x', 0).status_code, 404)
+
+    def test_other_users_upload(self):
+        data = png_bytes(noise=True)
+        theirs = self.start(data, owner=self.other)
+        self.assertEqual(self.patch(theirs, data[:100], 0).status_code, 404)
+        self.assertEqual(self.client.get(f'/api/uploads/{theirs}/').status_code, 404)
+
+        response = self.create_post(upload_id=theirs)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid upload', str(response.data['upload_id']))
+
+    def test_incomplete_upload_cannot_be_attached(self):
+        data = png_bytes(noise=True)
+        upload_id = self.start(data)
+        self.patch(upload_id, data[:100], 0)
+        response = self.create_post(upload_id=upload_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not complete', str(response.data['upload_id']))
+
+
+# -------------------------
+# 📄 API DOCS
+# -------------------------
+@override_settings(API_SCHEMA_DIR=Path(tempfile.mkdtemp()))
+class ApiDocsTests(SimpleTestCase):
+    def setUp(self):
+        docs._schema_cache.clear()
+        self.addCleanup(docs._schema_cache.clear)
+        self.path = docs.schema_path()
+        self.path.write_bytes(b'{"swagger": "2.0", "info": {"title": "Prebuilt"}}')
+
+    def test_serves_prebuilt_schema(self):
+        with mock.patch('drf_yasg.generators.OpenAPISchemaGenerator.get_schema') as get_schema:
+            response = self.client.get('/api/schema/')
+            again = self.client.get('/api/schema/')
+        get_schema.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, self.path.read_bytes())
+        self.assertEqual(again['ETag'], response['ETag'])
+        self.assertEqual(self.client.get('/api/schema/', headers={'If-None-Match': response['ETag']}).status_code, 304)
+
+    def test_rebuilt_schema_gets_new_etag(self):
+        etag = self.client.get('/api/schema/')['ETag']
+        self.path.write_bytes(b'{"swagger": "2.0", "info": {"title": "Rebuilt"}}')
+        os.utime(self.path, ns=(0, self.path.stat().st_mtime_ns + 1_000_000))
+        response = self.client.get('/api/schema/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Rebuilt', response.content)
+
+    def test_ui_pages_do_not_run_the_generator(self):
+        with mock.patch('drf_yasg.generators.OpenAPISchemaGenerator.get_schema') as get_schema:
+            for url in ('/api/docs/', '/api/redoc/'):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200, url)
+                self.assertContains(response, '"url": "/api/schema/"')
+                self.assertContains(response, 'Blog API')
+        get_schema.assert_not_called()
+
+    def test_drf_yasg_is_not_imported_at_startup(self):
+        # Fresh interpreter: this test process has already imported drf_yasg.
+        code = (
+            'import sys\n'
+            'from django.core.wsgi import get_wsgi_application\n'
+            'from django.urls import get_resolver\n'
+            'get_wsgi_application()\n'
+            'get_resolver().url_patterns\n'
+            'print("drf_yasg" in sys.modules)\n'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'shop.settings'},
+        )
+        self.assertEqual(result.stdout.strip(), 'False', result.stderr)
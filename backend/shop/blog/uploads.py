@@ -0,0 +1,227 @@
+import hashlib
+import shutil
+import tempfile
+import warnings
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+from PIL import Image, UnidentifiedImageError
+from rest_framework.exceptions import ValidationError
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Formats accepted for post images, mapped to the stored file extension.
+# (MPO is how Pillow reports multi-picture JPEGs written by most cameras.)
+IMAGE_EXTENSIONS = {'JPEG': 'jpg', 'MPO': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+
+
+# -------------------------
+# 📏 LIMITS & HEADER PROBING
+# -------------------------
+def probe_image(fileobj):
+    """
+    Return (format, (width, height)) read from the image header, or None if
+    the header is not (yet) recognisable. Pixel data is never decoded.
+
+    Raises ValidationError for headers Pillow refuses outright as
+    decompression bombs (over 2 * Image.MAX_IMAGE_PIXELS, far beyond
+    POST_IMAGE_MAX_PIXELS), so they get the dimension error too.
+    """
+    position = fileobj.tell()
+    fileobj.seek(0)
+    try:
+        with warnings.catch_warnings():
+            # We enforce our own, stricter pixel limit in check_dimensions().
+            warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+            with Image.open(fileobj) as img:
+                return img.format, img.size
+    except Image.DecompressionBombError:
+        raise ValidationError(
+            f'Image has too many pixels; at most {settings.POST_IMAGE_MAX_PIXELS} pixels are allowed.'
+        )
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        return None
+    finally:
+        fileobj.seek(position)
+
+
+def too_large(detail=''):
+    return ValidationError(f'Image is too large{detail}; the limit is {settings.POST_IMAGE_MAX_BYTES} bytes.')
+
+
+def check_size(size):
+    if size > settings.POST_IMAGE_MAX_BYTES:
+        raise too_large(f' ({size} bytes)')
+
+
+def check_header(header):
+    """Validate a probe_image() result against the allowed formats and dimensions."""
+    if header is None:
+        raise ValidationError('Upload a valid image. The file is not a recognised image format.')
+    fmt, (width, height) = header
+    if fmt not in IMAGE_EXTENSIONS:
+        raise ValidationError(f'Unsupported image format: {fmt}.')
+    if max(width, height) > settings.POST_IMAGE_MAX_SIDE:
+        raise ValidationError(
+            f'Image is {width}x{height}; the longest side may be at most {settings.POST_IMAGE_MAX_SIDE} pixels.'
+        )
+    if width * height > settings.POST_IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            f'Image is {width}x{height}; at most {settings.POST_IMAGE_MAX_PIXELS} pixels are allowed.'
+        )
+
+
+# -------------------------
+# 🗃️ CONTENT-ADDRESSED STORAGE
+# -------------------------
+def sha256_of(fileobj):
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(READ_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def store_post_image(fileobj, fmt):
+    """
+    Save an image under a name derived from its content hash and return the
+    storage name. Identical images are stored once and shared between posts.
+    """
+    name = f'post_images/{sha256_of(fileobj)}.{IMAGE_EXTENSIONS[fmt]}'
+    if default_storage.exists(name):
+        return name
+    return default_storage.save(name, fileobj)
+
+
+class PartFile(File):
+    """
+    An on-disk upload part. Exposing temporary_file_path() lets
+    FileSystemStorage move the file into place instead of copying it.
+    """
+
+    def temporary_file_path(self):
+        return self.name
+
+
+# -------------------------
+# 📥 MULTIPART UPLOAD HANDLER
+# -------------------------
+class BoundedUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams post image uploads straight to a temporary file on disk and
+    enforces POST_IMAGE_MAX_BYTES while the body is still arriving:
+
+    - a request whose Content-Length already rules it out is refused before
+      any of the body is read;
+    - a file that grows past the limit stops the upload, and the rest of the
+      body is never read off the socket.
+
+    Installed only on the views that accept post images (see PostViewSet),
+    so other file fields keep Django's default handlers.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.overflowed = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Non-file fields are capped separately by DATA_UPLOAD_MAX_MEMORY_SIZE.
+        if settings.DATA_UPLOAD_MAX_MEMORY_SIZE is not None:
+            if content_length > settings.POST_IMAGE_MAX_BYTES + settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+                raise too_large()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.POST_IMAGE_MAX_BYTES:
+            self.overflowed = True
+            raise StopUpload(connection_reset=True)
+        return super().receive_data_chunk(raw_data, start)
+
+    def upload_complete(self):
+        # Runs after the parser stops, so the request fails instead of
+        # silently arriving without its image.
+        if self.overflowed:
+            raise too_large()
+
+
+# -------------------------
+# 🧩 CHUNKED / RESUMABLE UPLOADS
+# -------------------------
+# The image header must be recognisable within this many leading bytes.
+PROBE_LIMIT = 256 * 1024
+
+
+def spool_chunk(stream, length):
+    """
+    Copy up to `length` bytes from the request `stream` into an anonymous
+    temporary file in IMAGE_UPLOAD_TEMP_DIR and return it, rewound. The
+    stream is copied in small reads, so a worker never holds more than
+    READ_CHUNK_SIZE of the image in memory. This is the slow part (it runs
+    at the client's pace), so callers do it outside any transaction.
+    """
+    directory = settings.IMAGE_UPLOAD_TEMP_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    chunk = tempfile.TemporaryFile(dir=directory)
+    remaining = length
+    while remaining > 0:
+        data = stream.read(min(READ_CHUNK_SIZE, remaining))
+        if not data:
+            break
+        chunk.write(data)
+        remaining -= len(data)
+    chunk.seek(0)
+    return chunk
+
+
+def append_chunk(upload, chunk):
+    """
+    Append a spooled chunk to the upload's part file at `upload.offset`,
+    validate the header as soon as it has arrived and finish the upload once
+    every byte is in. Callers hold the upload's row lock.
+
+    Raises ValidationError (and discards the part file) if a limit is broken.
+    """
+    path = upload.part_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(path, 'r+b' if path.exists() else 'w+b') as part:
+            # Anything past the committed offset is from an interrupted request.
+            part.seek(upload.offset)
+            shutil.copyfileobj(chunk, part, READ_CHUNK_SIZE)
+            part.truncate()
+            upload.offset = part.tell()
+
+            if not upload.format:
+                header = probe_image(part)
+                if header is not None or upload.offset >= min(upload.size, PROBE_LIMIT):
+                    check_header(header)
+                    upload.format, (upload.width, upload.height) = header
+
+        if upload.offset == upload.size:
+            finish_upload(upload)
+    except ValidationError:
+        path.unlink(missing_ok=True)
+        raise
+    upload.save()
+
+
+def finish_upload(upload):
+    """Verify the complete part file and move it into content-addressed storage."""
+    path = upload.part_path
+    try:
+        with Image.open(path) as img:
+            img.verify()
+    except Exception:
+        raise ValidationError('Upload a valid image. The file you uploaded was either not an image or a corrupted image.')
+
+    with PartFile(open(path, 'rb'), name=str(path)) as part:
+        upload.image = store_post_image(part, upload.format)
+    # Still present when the image was deduplicated against an existing file.
+    path.unlink(missing_ok=True)
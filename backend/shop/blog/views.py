@@ -1,13 +1,21 @@
-from rest_framework import viewsets, filters, status, permissions
+from rest_framework import viewsets, mixins, filters, status, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.throttling import UserRateThrottle, ScopedRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.db import transaction
 from django.utils.text import slugify
 
-from .models import Post, Category, Comment
-from .serializers import PostSerializer, CategorySerializer, CommentSerializer
+from .models import Post, Category, Comment, ImageUpload
+from .serializers import (
+    PostSerializer, CategorySerializer, CommentSerializer, ImageUploadSerializer, RelatedPostSerializer,
+)
 from .permissions import IsAuthorOrReadOnly
+from .uploads import BoundedUploadHandler, append_chunk, spool_chunk
+from .events import publish_post_event
 
 # ✅ Optional: you can define custom pagination globally in settings.py,
 # or per-view using PageNumberPagination if you want per-page control.
@@ -46,6 +54,11 @@ class PostViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     lookup_field = 'slug'  # Use slug instead of numeric ID for clean URLs
 
+    def initialize_request(self, request, *args, **kwargs):
+        # ✅ Post images stream to disk and are size-limited while they arrive
+        request.upload_handlers = [BoundedUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     # ✅ Enhancement 1: Auto-generate unique slugs on create
     def perform_create(self, serializer):
         base_slug = slugify(serializer.validated_data['title'])
@@ -66,10 +79,12 @@ class PostViewSet(viewsets.ModelViewSet):
             serializer = CommentSerializer(data=request.data)
 
             if serializer.is_valid():
-                serializer.save(
+                comment = serializer.save(
                     post=post,
                     author=request.user if request.user.is_authenticated else None
                 )
+                if comment.approved:
+                    publish_post_event(post, 'comment', {'comment': serializer.data})
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
 
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -95,10 +110,12 @@ class PostViewSet(viewsets.ModelViewSet):
             post.likes.add(user)
             liked = True
 
-        # ✅ Enhancement: return updated like count
+        # ✅ Enhancement: return updated like count (and push it to open tabs)
+        likes_count = post.likes.count()
+        publish_post_event(post, 'like', {'likes_count': likes_count})
         return Response({
             'liked': liked,
-            'likes_count': post.likes.count()
+            'likes_count': likes_count
         }, status=status.HTTP_200_OK)
 
     # ✅ Enhancement 5: Get approved comments for a post (paginated)
@@ -118,6 +135,35 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer = CommentSerializer(comments, many=True)
         return Response(serializer.data)
 
+    # ✅ Enhancement 7: Related posts from the precomputed similarity index
+    @action(detail=True, methods=['get'])
+    def related(self, request, slug=None):
+        """
+        Up to `limit` (default 5, max 20) published posts similar to this one.
+        Falls back to the latest posts in the same category until
+        `manage.py build_related_index` has been run.
+        """
+        from .related import get_index  # keeps numpy out of worker startup
+
+        post = self.get_object()
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 5)), 20))
+        except ValueError:
+            limit = 5
+
+        index = get_index()
+        if index is not None:
+            ids = [post_id for post_id, _ in index.query(post, k=limit)]
+            by_id = Post.objects.select_related('author', 'category').filter(published=True).in_bulk(ids)
+            posts = [by_id[post_id] for post_id in ids if post_id in by_id]
+        else:
+            posts = (Post.objects.select_related('author', 'category')
+                     .filter(published=True, category_id=post.category_id)
+                     .exclude(pk=post.pk)[:limit])
+
+        serializer = RelatedPostSerializer(posts, many=True, context={'request': request})
+        return Response(serializer.data)
+
 
 # ---------------------------
 # COMMENT VIEWSET
@@ -125,7 +171,7 @@ class PostViewSet(viewsets.ModelViewSet):
 class CommentViewSet(viewsets.ModelViewSet):
     """
     Handles CRUD operations for comments.
-    Includes search, filter, and soft delete in the future.
+    Includes search, filter, and soft delete.
     """
     queryset = Comment.objects.select_related('post', 'author').all()
     serializer_class = CommentSerializer
@@ -137,11 +183,86 @@ class CommentViewSet(viewsets.ModelViewSet):
     # ✅ Enhancement 6: Soft delete option
     def perform_destroy(self, instance):
         """
-        Instead of permanently deleting a comment,
-        you could mark it as deleted for moderation purposes.
+        Instead of permanently deleting a comment, mark it as deleted for
+        moderation purposes. The default manager hides it from then on and
+        `archive_comments` later moves it out of the hot table.
+        """
+        instance.soft_delete()
+        publish_post_event(instance.post, 'comment_deleted', {'id': instance.id})
+
+
+# ---------------------------
+# IMAGE UPLOAD VIEWSET
+# ---------------------------
+class ImageUploadViewSet(mixins.CreateModelMixin,
+                         mixins.RetrieveModelMixin,
+                         viewsets.GenericViewSet):
+    """
+    Chunked, resumable uploads for post images:
+    - POST  /uploads/       {filename, size} -> starts an upload
+    - PATCH /uploads/<id>/  raw bytes + `Upload-Offset` header -> appends a chunk
+    - GET   /uploads/<id>/  current offset, to resume after a failure
+    A finished upload is attached to a post by sending its id as `upload_id`.
+    """
+    serializer_class = ImageUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    http_method_names = ['get', 'post', 'patch', 'head', 'options']
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):  # schema generation
+            return ImageUpload.objects.none()
+        return ImageUpload.objects.filter(owner=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    def partial_update(self, request, pk=None):
+        """
+        Append one chunk. The body is streamed to disk and never parsed,
+        so it is not buffered by DRF or Django. The row lock is only held
+        while the spooled chunk is appended, never while the client sends it.
         """
-        # Uncomment below to enable soft delete:
-        # instance.deleted = True
-        # instance.save()
-        # return Response({'status': 'comment marked as deleted'})
-        instance.delete()  # Currently performs hard delete
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response({'error': 'Upload-Offset header is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            length = int(request.META['CONTENT_LENGTH'])
+        except (KeyError, ValueError):
+            # Chunked transfer encoding: we could not bound the read.
+            return Response({'error': 'Content-Length header is required.'},
+                            status=status.HTTP_411_LENGTH_REQUIRED)
+        if length <= 0:
+            return Response({'error': 'Chunk is empty.'}, status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.POST_IMAGE_CHUNK_SIZE:
+            return Response({'error': f'Chunks may be at most {settings.POST_IMAGE_CHUNK_SIZE} bytes.'},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        rejected = self._check_offset(get_object_or_404(self.get_queryset(), pk=pk), offset, length)
+        if rejected:
+            return rejected
+
+        with spool_chunk(request.stream, length) as chunk:
+            try:
+                with transaction.atomic():
+                    upload = get_object_or_404(self.get_queryset().select_for_update(), pk=pk)
+                    # ✅ Another request may have appended while this chunk was in flight
+                    rejected = self._check_offset(upload, offset, length)
+                    if rejected:
+                        return rejected
+                    append_chunk(upload, chunk)
+            except ValidationError:
+                # A rejected image cannot be resumed; its part file is already gone.
+                ImageUpload.objects.filter(pk=pk).delete()
+                raise
+
+        return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
+
+    def _check_offset(self, upload, offset, length):
+        # ✅ Out-of-sync clients get the committed offset back and resume from there
+        if upload.complete or offset != upload.offset:
+            return Response(self.get_serializer(upload).data, status=status.HTTP_409_CONFLICT)
+        if offset + length > upload.size:
+            return Response({'error': 'Chunk extends past the declared upload size.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return None
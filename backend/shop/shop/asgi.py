@@ -3,6 +3,20 @@ ASGI config for shop project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project with an ASGI server so live updates (Server-Sent Events,
+blog/events.py) can hold connections open without tying up worker threads:
+
+    uvicorn shop.asgi:application --reload     # development
+    uvicorn shop.asgi:application --port 8000  # production
+
+Keep it to ONE worker process while EVENTS_BROKER is the default
+InProcessBroker: it only reaches streams held by the process that published,
+so with `--workers N` (or a separate WSGI server for the API) most events are
+silently lost. Point EVENTS_BROKER at a shared broker before adding workers.
+
+`manage.py runserver` is WSGI-only; it still serves the API, but the event
+streams answer 503 there.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
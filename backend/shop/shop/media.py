@@ -0,0 +1,137 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# Single "bytes=start-end" / "bytes=start-" / "bytes=-suffix" range.
+# Multi-range requests are answered with the full body, which RFC 9110 allows.
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _parse_range(header, size):
+    """
+    Return (start, end) inclusive for a satisfiable single range, None when the
+    header should be ignored, or False when the range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes.
+        length = int(end)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix('W/') for t in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve an uploaded file from MEDIA_ROOT.
+
+    Validators (ETag / Last-Modified) are always answered here. The body is
+    then either handed to the front proxy (MEDIA_SENDFILE_BACKEND = 'xsendfile'
+    for Apache/lighttpd, 'nginx' for X-Accel-Redirect), which also deals with
+    Range, or streamed from Python with single-range support.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    try:
+        stat = fullpath.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('File not found')
+    if not fullpath.is_file():
+        raise Http404('File not found')
+
+    etag = _etag(stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': f'public, max-age={settings.MEDIA_MAX_AGE}',
+        'Accept-Ranges': 'bytes',
+    }
+
+    if _not_modified(request, etag, stat.st_mtime):
+        return HttpResponseNotModified(headers=headers)
+
+    content_type, encoding = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or 'application/octet-stream'
+    if encoding:
+        headers['Content-Encoding'] = encoding
+
+    # ✅ Offload the transfer to the front proxy. Paths are percent-encoded so
+    # names with spaces or non-ASCII characters survive the header; nginx,
+    # lighttpd and mod_xsendfile (XSendFileUnescape, on by default) decode them.
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend == 'xsendfile':
+        headers['X-Sendfile'] = quote(str(fullpath))
+        return HttpResponse(content_type=content_type, headers=headers)
+    if backend == 'nginx':
+        headers['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_REDIRECT_PREFIX + path)
+        return HttpResponse(content_type=content_type, headers=headers)
+
+    # Pure-Python fallback: honour Range unless If-Range says the file changed.
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (if_range is None or if_range == etag):
+        byte_range = _parse_range(range_header, stat.st_size)
+        if byte_range is False:
+            headers['Content-Range'] = f'bytes */{stat.st_size}'
+            return HttpResponse(status=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            headers['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            headers['Content-Length'] = str(length)
+            return StreamingHttpResponse(
+                _iter_range(fullpath, start, length),
+                status=206, content_type=content_type, headers=headers,
+            )
+
+    response = FileResponse(fullpath.open('rb'), content_type=content_type)
+    for key, value in headers.items():
+        response.headers[key] = value
+    return response
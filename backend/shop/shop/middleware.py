@@ -0,0 +1,213 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+
+# -------------------------
+# 🗜️ CODECS
+# -------------------------
+class GzipCodec:
+    name = 'gzip'
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compressobj(self):
+        # wbits=31 -> zlib emits a gzip container (header + crc32 trailer)
+        return _ZlibStream(zlib.compressobj(self.level, zlib.DEFLATED, 31))
+
+
+class BrotliCodec:
+    name = 'br'
+
+    def __init__(self, level=5):
+        self.level = level
+
+    def compressobj(self):
+        return _BrotliStream(brotli.Compressor(quality=self.level))
+
+
+class ZstdCodec:
+    name = 'zstd'
+
+    def __init__(self, level=3):
+        self.level = level
+
+    def compressobj(self):
+        return _ZlibStream(zstandard.ZstdCompressor(level=self.level).compressobj())
+
+
+class _ZlibStream:
+    """Common `compress`/`finish` interface over zlib-style compressobj APIs."""
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def compress(self, data):
+        return self.obj.compress(data)
+
+    def finish(self):
+        return self.obj.flush()
+
+
+class _BrotliStream:
+    def __init__(self, obj):
+        self.obj = obj
+
+    def compress(self, data):
+        return self.obj.process(data)
+
+    def finish(self):
+        return self.obj.finish()
+
+
+def available_codecs():
+    """Codecs usable in this environment, in server preference order."""
+    codecs = []
+    if zstandard is not None:
+        codecs.append(ZstdCodec())
+    if brotli is not None:
+        codecs.append(BrotliCodec())
+    codecs.append(GzipCodec())
+    return codecs
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header into {coding: qvalue}.
+    Malformed qvalues are treated as 0 (not acceptable).
+    """
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+# -------------------------
+# 📦 COMPRESSION MIDDLEWARE
+# -------------------------
+class CompressionMiddleware:
+    """
+    Negotiates gzip / brotli / zstd response compression from Accept-Encoding.
+
+    - Picks the codec with the highest client qvalue, ties broken by server
+      preference (zstd > br > gzip); `*` wildcards and q=0 are honoured.
+    - Buffered responses smaller than COMPRESSION_MIN_SIZE are sent as-is.
+    - Streaming responses (exports, file downloads) are compressed chunk by
+      chunk so the body is never buffered in memory.
+    - Only API and static-asset content types are compressed; images,
+      archives, partial content and Server-Sent Events pass through untouched.
+    - HTML is never compressed: admin and browsable-API pages carry a CSRF
+      token next to reflected input (e.g. the `q` search term), which is
+      what BREACH needs. Django's GZipMiddleware pads gzip output to blunt
+      that; there is no equivalent for br / zstd, so HTML is left alone.
+    """
+    compressible_types = (
+        'application/json', 'application/javascript', 'application/xml',
+        'application/vnd.oai.openapi', 'text/css', 'text/javascript',
+        'text/plain', 'text/csv', 'image/svg+xml',
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 512)
+        self.codecs = available_codecs()
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def select_codec(self, accept_encoding):
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get('*', 0.0)
+        best, best_q = None, 0.0
+        for codec in self.codecs:
+            q = accepted.get(codec.name, wildcard)
+            if q > best_q:
+                best, best_q = codec, q
+        return best
+
+    def should_compress(self, response):
+        if response.status_code != 200 or response.has_header('Content-Encoding'):
+            return False
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(self.compressible_types):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        if not response.streaming and len(response.content) < self.min_size:
+            return False
+        return True
+
+    def process_response(self, request, response):
+        if not self.should_compress(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        codec = self.select_codec(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if codec is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._compress_async(codec, response.streaming_content)
+            else:
+                response.streaming_content = self._compress_sequence(codec, response.streaming_content)
+            # We won't know the compressed size until it's streamed.
+            del response.headers['Content-Length']
+        else:
+            stream = codec.compressobj()
+            compressed = stream.compress(response.content) + stream.finish()
+            # Return the compressed content only if it's actually shorter.
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # A strong ETag no longer matches the encoded bytes (RFC 9110 8.8.1).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = codec.name
+        return response
+
+    @staticmethod
+    def _compress_sequence(codec, sequence):
+        stream = codec.compressobj()
+        for chunk in sequence:
+            data = stream.compress(chunk)
+            if data:
+                yield data
+        yield stream.finish()
+
+    @staticmethod
+    async def _compress_async(codec, sequence):
+        stream = codec.compressobj()
+        async for chunk in sequence:
+            data = stream.compress(chunk)
+            if data:
+                yield data
+        yield stream.finish()
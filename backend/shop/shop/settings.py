@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,7 +45,6 @@ INSTALLED_APPS = [
   
     'corsheaders',
     'rest_framework_simplejwt',
-    'drf_yasg',
     
 
     "blog",
@@ -51,6 +53,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "shop.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -64,13 +68,21 @@ CORS_ALLOWED_ORIGINS = [
   "http://localhost:3000", #React
   "http://localhost:5173", #Vite
 ]
+# Chunked image uploads (blog.views.ImageUploadViewSet) send Upload-Offset
+CORS_ALLOW_HEADERS = (*default_headers, "upload-offset")
 
 ROOT_URLCONF = "shop.urls"
 
+# drf_yasg is deliberately not in INSTALLED_APPS: importing the package pulls
+# in pkg_resources, which every worker would pay for at startup. Its templates
+# and static files are wired in by path (find_spec does not import it) and
+# blog/docs.py imports it on the first docs request.
+DRF_YASG_DIR = Path(find_spec("drf_yasg").origin).parent
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [DRF_YASG_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -84,6 +96,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "shop.wsgi.application"
+# Used for live updates (SSE); run with `uvicorn shop.asgi:application`
+ASGI_APPLICATION = "shop.asgi.application"
 
 from datetime import timedelta
 
@@ -96,6 +110,10 @@ REST_FRAMEWORK = {
   ),
   'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
   'PAGE_SIZE': 6,
+  'DEFAULT_RENDERER_CLASSES': (
+    'blog.renderers.FastJSONRenderer',
+    'rest_framework.renderers.BrowsableAPIRenderer',
+  ),
   'DEFAULT_FILTER_BACKENDS': (
     'django_filters.rest_framework.DjangoFilterBackend',
     'rest_framework.filters.SearchFilter',
@@ -103,6 +121,31 @@ REST_FRAMEWORK = {
   ),
 }
 
+# Responses smaller than this (in bytes) are not worth compressing
+COMPRESSION_MIN_SIZE = 512
+
+# 📄 API docs: schema is prebuilt by `manage.py build_api_schema` and the
+# Swagger / ReDoc pages load it from the `api-schema` URL.
+API_SCHEMA_DIR = BASE_DIR / "schema"
+SWAGGER_SETTINGS = {"SPEC_URL": "api-schema"}
+REDOC_SETTINGS = {"SPEC_URL": "api-schema"}
+
+# 📡 Live post updates over Server-Sent Events (see blog/events.py; served
+# under ASGI only, see shop/asgi.py). The in-process broker requires a single
+# server process; use a shared broker before running more workers.
+EVENTS_BROKER = "blog.events.InProcessBroker"
+EVENTS_REPLAY_BUFFER = 100      # events kept per channel for Last-Event-ID resume
+EVENTS_SUBSCRIBER_QUEUE = 64    # undelivered events before a slow client is cut off
+EVENTS_MAX_CHANNELS = 10_000    # idle channels beyond this are forgotten (LRU)
+EVENTS_HEARTBEAT = 15           # seconds between keepalive comments
+EVENTS_RETRY_MS = 3000          # client reconnect delay
+
+# 🔗 Related posts (see blog/related.py; built by `manage.py build_related_index`)
+RELATED_INDEX_DIR = BASE_DIR / "related_index"
+RELATED_INDEX_DIMENSIONS = 256
+RELATED_CATEGORY_BOOST = 0.15   # added to the cosine score for the same category
+RELATED_AUTHOR_BOOST = 0.05     # ... and for the same author
+
 SIMPLE_JWT = {
   'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
   'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -157,10 +200,49 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STATICFILES_DIRS = [DRF_YASG_DIR / "static"]
+
+# WhiteNoise serves `collectstatic` output with precompressed (gzip/brotli)
+# variants and content-hashed names, cached for a year as immutable.
+# The manifest only exists after `collectstatic`, so development (DEBUG)
+# keeps plain names served straight from the finders.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploaded media is served by shop.media.serve_media.
+# MEDIA_SENDFILE_BACKEND: None (stream from Python), 'xsendfile' (Apache /
+# lighttpd X-Sendfile) or 'nginx' (X-Accel-Redirect to an internal location
+# that maps MEDIA_ACCEL_REDIRECT_PREFIX onto MEDIA_ROOT).
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+MEDIA_MAX_AGE = 60 * 60 * 24
+
+# 📤 Post image uploads (see blog/uploads.py)
+# Multipart post images stream to a temp file (BoundedUploadHandler, installed
+# by PostViewSet); chunked uploads are appended to part files in
+# IMAGE_UPLOAD_TEMP_DIR (must be shared by all workers).
+IMAGE_UPLOAD_TEMP_DIR = BASE_DIR / "tmp_uploads"
+POST_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+POST_IMAGE_MAX_PIXELS = 25_000_000
+POST_IMAGE_MAX_SIDE = 10_000
+POST_IMAGE_CHUNK_SIZE = 1024 * 1024
+# Unfinished uploads older than this are removed by `purge_stale_uploads`
+IMAGE_UPLOAD_EXPIRY = timedelta(days=1)
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -1,17 +1,14 @@
 # 📁 project/urls.py
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView
 )
 from django.conf import settings
-from django.conf.urls.static import static
-from rest_framework.documentation import include_docs_urls
-from rest_framework.schemas import get_schema_view
 
-# 🧩 Optional: browsable API schema (useful for testing endpoints)
-schema_view = get_schema_view(title="Blog API")
+from blog.docs import openapi_schema
+from .media import serve_media
 
 urlpatterns = [
     # 🛠 Admin Panel
@@ -24,11 +21,12 @@ urlpatterns = [
     path("api/auth/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
 
-    # 📄 Optional: DRF API schema & documentation (for debugging or frontend devs)
-    path("api/schema/", schema_view, name="api-schema"),
+    # 📄 Prebuilt OpenAPI schema (`manage.py build_api_schema`), also used by the docs UIs
+    path("api/schema/", openapi_schema, name="api-schema"),
 ]
 
-# 🖼️ Serve uploaded media files during development
-# (e.g., post images uploaded via PostSerializer)
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# 🖼️ Serve uploaded media files (e.g., post images uploaded via PostSerializer)
+# with conditional/Range support, or offloaded to the front proxy in production.
+urlpatterns += [
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.*)$", serve_media, name="media"),
+]
@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_BASE = import.meta.env.VITE_API_BASE || 'http://localhost:8000/api';
+export const API_BASE = import.meta.env.VITE_API_BASE || 'http://localhost:8000/api';
 
 const getAccessToken = () => localStorage.getItem('access_token');
 const getRefreshToken = () => localStorage.getItem('refresh_token');
@@ -71,4 +71,58 @@ api.interceptors.response.use(
   }
 );
 
+// Uploads a file in chunks through /uploads/ and resolves with the upload id.
+// Progress is kept per file in localStorage, so a failed or interrupted
+// upload resumes from the last committed offset instead of starting over.
+export const uploadImage = async (file, { onProgress, retries = 3 } = {}) => {
+  const key = `upload:${file.name}:${file.size}:${file.lastModified}`;
+  let upload = null;
+
+  const saved = localStorage.getItem(key);
+  if (saved) {
+    try {
+      upload = (await api.get(`/uploads/${saved}/`)).data;
+    } catch {
+      localStorage.removeItem(key);
+    }
+  }
+  if (!upload) {
+    upload = (await api.post('/uploads/', { filename: file.name, size: file.size })).data;
+    localStorage.setItem(key, upload.id);
+  }
+
+  let attempts = 0;
+  while (!upload.complete) {
+    const chunk = file.slice(upload.offset, upload.offset + upload.chunk_size);
+    try {
+      const res = await api.patch(`/uploads/${upload.id}/`, chunk, {
+        headers: {
+          'Content-Type': 'application/offset+octet-stream',
+          'Upload-Offset': upload.offset,
+        },
+      });
+      if (res.data.offset === upload.offset && !res.data.complete) {
+        throw new Error('Upload made no progress.');
+      }
+      upload = res.data;
+      attempts = 0;
+      if (onProgress) onProgress(upload.offset / upload.size);
+    } catch (error) {
+      if (error.response?.status === 409) {
+        // Server is at a different offset: continue from there.
+        upload = error.response.data;
+      } else if (!error.response && attempts < retries) {
+        attempts += 1;
+        upload = (await api.get(`/uploads/${upload.id}/`)).data;
+      } else {
+        localStorage.removeItem(key);
+        throw error;
+      }
+    }
+  }
+
+  localStorage.removeItem(key);
+  return upload.id;
+};
+
 export default api;
\ No newline at end of file
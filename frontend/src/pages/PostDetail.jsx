@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useRef, useMemo } from 'react';
-import api from '../api';
+import api, { API_BASE } from '../api';
 import { useParams, useNavigate } from 'react-router-dom';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
@@ -81,6 +81,33 @@ export default function PostDetail() {
     if (post) document.title = `${post.title} | Blog`;
   }, [post]);
 
+  // 📡 Live likes & comments pushed by the server (no polling).
+  // EventSource reconnects on its own and resumes via Last-Event-ID.
+  // A backend without ASGI answers 503, and EventSource then gives up for good.
+  useEffect(() => {
+    const source = new EventSource(`${API_BASE}/posts/${slug}/events/`);
+
+    source.addEventListener('like', (e) => {
+      const { likes_count } = JSON.parse(e.data);
+      setPost((prev) => (prev ? { ...prev, likes_count } : prev));
+    });
+    source.addEventListener('comment', (e) => {
+      const { comment } = JSON.parse(e.data);
+      setPost((prev) => {
+        if (!prev || prev.comments.some((c) => c.id === comment.id)) return prev;
+        return { ...prev, comments: [...prev.comments, comment] };
+      });
+    });
+    source.addEventListener('comment_deleted', (e) => {
+      const { id } = JSON.parse(e.data);
+      setPost((prev) => (prev ? { ...prev, comments: prev.comments.filter((c) => c.id !== id) } : prev));
+    });
+    // Missed too many updates while disconnected: reload the post once.
+    source.addEventListener('reset', () => fetchPost());
+
+    return () => source.close();
+  }, [slug]);
+
   const toggleLike = async () => {
     if (!isAuthenticated()) {
       toast.warn('You must be logged in to like.');
@@ -112,7 +139,9 @@ export default function PostDetail() {
     setSubmitting(true);
     try {
       const res = await api.post(`/posts/${post.slug}/add_comment/`, { body: commentBody });
-      setPost({ ...post, comments: [...post.comments, res.data] });
+      setPost((prev) => (prev.comments.some((c) => c.id === res.data.id)
+        ? prev
+        : { ...prev, comments: [...prev.comments, res.data] }));
       setCommentBody('');
       toast.success('Comment added!');
     } catch (err) {
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from "react";
-import api from "../api";
+import api, { uploadImage } from "../api";
 import { useNavigate, useParams } from "react-router-dom";
 import { toast } from "react-toastify";
 import "react-toastify/dist/ReactToastify.css";
@@ -12,6 +12,7 @@ export default function PostForm({ edit = false }) {
   const [image, setImage] = useState(null);
   const [err, setErr] = useState("");
   const [loading, setLoading] = useState(false);
+  const [uploadProgress, setUploadProgress] = useState(null);
   const [darkMode, setDarkMode] = useState(false);
 
   const textareaRef = useRef(null);
@@ -78,7 +79,13 @@ export default function PostForm({ edit = false }) {
       formData.append("content", content);
       if (categoryId) formData.append("category_id", categoryId);
       formData.append("published", true);
-      if (image) formData.append("image", image);
+
+      // 🖼️ Images go through the chunked upload endpoint, not this request
+      if (image) {
+        setUploadProgress(0);
+        const uploadId = await uploadImage(image, { onProgress: setUploadProgress });
+        formData.append("upload_id", uploadId);
+      }
 
       if (edit) {
         const list = await api.get("/posts/", { params: { search: slug } });
@@ -107,6 +114,7 @@ export default function PostForm({ edit = false }) {
       toast.error("Failed to submit post.");
     } finally {
       setLoading(false);
+      setUploadProgress(null);
     }
   };
 
@@ -222,7 +230,9 @@ export default function PostForm({ edit = false }) {
               : "bg-blue-600 hover:bg-blue-700"
           }`}
         >
-          {loading
+          {uploadProgress !== null
+            ? `Uploading image... ${Math.round(uploadProgress * 100)}%`
+            : loading
             ? edit
               ? "Updating..."
               : "Creating..."